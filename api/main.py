@@ -1,42 +1,49 @@
 """FastAPI application."""
+import asyncio
 import logging
 import os
-import hmac
-import hashlib
 import time
 from fastapi import FastAPI, Request, Response, HTTPException, Depends
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import ORJSONResponse, FileResponse
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
-import json
+import orjson
 
 from config import settings
-from database.session import get_db, init_db
+from database.session import SessionLocal, get_db, init_db
 from database.models import Subscriber, Opportunity, Proposal
-from tools.whatsapp import get_whatsapp_sender, BaseWhatsAppSender
+from tools.whatsapp import (
+    get_whatsapp_sender,
+    close_whatsapp_senders,
+    BaseWhatsAppSender,
+    delivery_tracker,
+)
 from agents.router import AgentRouter
 from agents.proposal_writer import ProposalWriter
 from agents.intent import detect_intent, Intent
 from tools.ics_generator import generate_ics
+from tools.proposal_links import (
+    create_signed_proposal_download_url,
+    verify_proposal_download_signature,
+)
+from scheduler.scheduler import Scheduler
 from datetime import datetime
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.log_level))
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Nigerian Grants Agent", version="1.0.0")
+app = FastAPI(
+    title="Nigerian Grants Agent",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Initialize components
 whatsapp_sender: BaseWhatsAppSender = get_whatsapp_sender()
 agent_router = AgentRouter()
 proposal_writer = ProposalWriter()
-
-
-def _sign_proposal_link(proposal_id: int, pdf_path: str, expires_at: int) -> str:
-    """Create HMAC signature for proposal link."""
-    msg = f"{proposal_id}:{expires_at}:{pdf_path}".encode()
-    secret = settings.proposal_link_secret.encode()
-    return hmac.new(secret, msg, hashlib.sha256).hexdigest()
+scheduler: Optional[Scheduler] = None
 
 
 def normalize_whatsapp_number(number: Optional[str]) -> str:
@@ -122,12 +129,30 @@ async def process_incoming_message(from_number: str, message_text: str, db: Sess
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database and start the cron scheduler on startup."""
+    global scheduler
     try:
         init_db()
         logger.info("Application started successfully")
     except Exception as e:
         logger.error(f"Error during startup: {e}")
+    
+    # Scheduler jobs run as coroutines on the server's event loop
+    scheduler = Scheduler()
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the scheduler, flush queued WhatsApp messages and release shared pools."""
+    if scheduler is not None:
+        scheduler.stop()
+    # Blocks until the background dispatchers have sent what is still queued
+    await asyncio.to_thread(close_whatsapp_senders)
+    from tools.pdf_extractor import shutdown_executor
+    await asyncio.to_thread(shutdown_executor)
+    from rag.store import EmbeddingClient
+    EmbeddingClient.close()
 
 
 @app.get("/health")
@@ -256,8 +281,7 @@ async def get_proposal(proposal_id: int, exp: int, sig: str, db: Session = Depen
     if not proposal or not proposal.pdf_path:
         raise HTTPException(status_code=404, detail="Proposal not found")
     
-    expected_sig = _sign_proposal_link(proposal_id, proposal.pdf_path, exp)
-    if not hmac.compare_digest(expected_sig, sig):
+    if not verify_proposal_download_signature(proposal_id, exp, sig):
         raise HTTPException(status_code=403, detail="Invalid signature")
     
     if not os.path.exists(proposal.pdf_path):
@@ -267,20 +291,28 @@ async def get_proposal(proposal_id: int, exp: int, sig: str, db: Session = Depen
     return FileResponse(proposal.pdf_path, media_type="application/pdf", filename=filename)
 
 
-async def handle_meta_webhook(request: Request, db: Session) -> JSONResponse:
+async def handle_meta_webhook(request: Request, db: Session) -> ORJSONResponse:
     """Handle Meta WhatsApp webhook payload."""
     try:
-        body = await request.json()
-        logger.info("Received Meta WhatsApp webhook: %s", json.dumps(body, indent=2))
+        body = orjson.loads(await request.body())
+        logger.info(
+            "Received Meta WhatsApp webhook: %s",
+            orjson.dumps(body, option=orjson.OPT_INDENT_2).decode("utf-8")
+        )
 
         if body.get("object") != "whatsapp_business_account":
-            return JSONResponse(content={"status": "ignored"})
+            return ORJSONResponse(content={"status": "ignored"})
 
         entries = body.get("entry", [])
         for entry in entries:
             changes = entry.get("changes", [])
             for change in changes:
                 value = change.get("value", {})
+
+                # Delivery callbacks for messages sent with send_text_nowait
+                for status in value.get("statuses", []):
+                    delivery_tracker.update_from_webhook(status.get("id", ""), status.get("status", ""))
+
                 messages = value.get("messages", [])
 
                 for message in messages:
@@ -292,13 +324,13 @@ async def handle_meta_webhook(request: Request, db: Session) -> JSONResponse:
 
                     await process_incoming_message(from_number, message_text, db)
 
-        return JSONResponse(content={"status": "ok"})
+        return ORJSONResponse(content={"status": "ok"})
     except Exception as exc:
         logger.error("Error handling Meta webhook: %s", exc)
-        return JSONResponse(content={"status": "error", "message": str(exc)}, status_code=500)
+        return ORJSONResponse(content={"status": "error", "message": str(exc)}, status_code=500)
 
 
-async def handle_twilio_webhook(request: Request, db: Session) -> JSONResponse:
+async def handle_twilio_webhook(request: Request, db: Session) -> ORJSONResponse:
     """Handle Twilio WhatsApp webhook payload."""
     try:
         form = await request.form()
@@ -309,7 +341,9 @@ async def handle_twilio_webhook(request: Request, db: Session) -> JSONResponse:
         if message_status:
             logger.debug("Received Twilio status callback: %s for MessageSid: %s", 
                         message_status, form_dict.get("MessageSid", "unknown"))
-            return JSONResponse(content={"status": "ok"})
+            # Delivery callbacks for messages sent with send_text_nowait
+            delivery_tracker.update_from_webhook(form_dict.get("MessageSid", ""), message_status)
+            return ORJSONResponse(content={"status": "ok"})
         
         # This is an incoming message - validate signature
         signature = request.headers.get("X-Twilio-Signature", "")
@@ -369,7 +403,7 @@ async def handle_twilio_webhook(request: Request, db: Session) -> JSONResponse:
             
             # For development: allow bypassing signature validation
             # Set ENABLE_TWILIO_SIGNATURE_VALIDATION=false in .env to disable
-            if settings.app_env == "development" and not os.getenv("ENABLE_TWILIO_SIGNATURE_VALIDATION", "true").lower() == "true":
+            if settings.app_env == "development" and not settings.enable_twilio_signature_validation:
                 logger.warning("Bypassing Twilio signature validation in development mode")
                 is_valid = True
             
@@ -380,18 +414,18 @@ async def handle_twilio_webhook(request: Request, db: Session) -> JSONResponse:
         message_text = form_dict.get("Body", "")
         if not message_text:
             logger.info("No message body in Twilio webhook, ignoring")
-            return JSONResponse(content={"status": "ignored"})
+            return ORJSONResponse(content={"status": "ignored"})
 
         from_number = normalize_whatsapp_number(form_dict.get("From"))
         logger.info("Processing incoming Twilio message from %s: %s", from_number, message_text[:50])
         await process_incoming_message(from_number, message_text, db)
 
-        return JSONResponse(content={"status": "ok"})
+        return ORJSONResponse(content={"status": "ok"})
     except HTTPException:
         raise
     except Exception as exc:
         logger.error("Error handling Twilio webhook: %s", exc, exc_info=True)
-        return JSONResponse(content={"status": "error", "message": str(exc)}, status_code=500)
+        return ORJSONResponse(content={"status": "error", "message": str(exc)}, status_code=500)
 
 
 async def handle_digest_request(from_number: str, db: Session):
@@ -536,9 +570,7 @@ async def handle_proposal_request(from_number: str, item_num: int, db: Session):
         if is_twilio:
             # Generate signed link if configured
             if settings.public_base_url and settings.proposal_link_secret:
-                expires_at = int(time.time()) + settings.proposal_link_ttl_seconds
-                sig = _sign_proposal_link(proposal.id, pdf_path, expires_at)
-                link = f"{settings.public_base_url}/proposals/{proposal.id}?exp={expires_at}&sig={sig}"
+                link = create_signed_proposal_download_url(proposal.id)
                 whatsapp_sender.send_text(
                     from_number,
                     f"Proposal for: {opportunity.title}\n{link}"
@@ -650,9 +682,19 @@ async def handle_query(from_number: str, query: str, db: Session):
         )
 
 
-@app.post("/cron/run")
-async def run_cron(db: Session = Depends(get_db)):
-    """Manually trigger crawl and digest."""
+async def run_cron_job(db: Optional[Session] = None) -> Dict[str, Any]:
+    """
+    Crawl all active sources, ingest the results and optionally send digests.
+    
+    Args:
+        db: Optional database session; a new one is opened (and closed) if omitted
+    
+    Returns:
+        Summary with crawled and digest counts
+    """
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
     try:
         from ingest.ingester import Ingester
         from crawler.crawler import Crawler
@@ -726,6 +768,16 @@ async def run_cron(db: Session = Depends(get_db)):
             "crawled": crawled_count,
             "digests_sent": digest_count
         }
+    finally:
+        if owns_session:
+            db.close()
+
+
+@app.post("/cron/run")
+async def run_cron(db: Session = Depends(get_db)):
+    """Manually trigger crawl and digest."""
+    try:
+        return await run_cron_job(db)
     except Exception as e:
         logger.error(f"Error running cron: {e}")
         raise HTTPException(status_code=500, detail=str(e))
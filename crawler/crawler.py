@@ -81,7 +81,9 @@ class Crawler:
                         fetched_at=fetched_at,
                         http_hash=http_hash,
                         mime="text/html",
-                        raw_text=content
+                        raw_text=content,
+                        # The RSS hash is taken over the extracted text itself
+                        text_hash=http_hash
                     )
                     results.append(result)
                 except Exception as e:
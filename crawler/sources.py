@@ -1,11 +1,14 @@
 """Source configuration management."""
 import yaml
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Parsed sources keyed by config path, tagged with the file's mtime
+_sources_cache: Dict[Path, Tuple[int, List["SourceConfig"]]] = {}
+
 
 class SourceConfig:
     """Source configuration."""
@@ -29,16 +32,23 @@ class SourceConfig:
 
 
 def load_sources(config_path: Optional[str] = None) -> List[SourceConfig]:
-    """Load sources from YAML file."""
+    """Load sources from YAML file (cached until the file's mtime changes)."""
     if config_path is None:
         config_path = Path(__file__).parent / "sources.yaml"
     else:
         config_path = Path(config_path)
     
-    if not config_path.exists():
+    try:
+        mtime = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
         logger.warning(f"Sources config not found at {config_path}, using defaults")
         return []
     
+    # Reparse the YAML only when the file has changed
+    cached = _sources_cache.get(config_path)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+    
     try:
         with open(config_path, "r", encoding="utf-8") as f:
             data = yaml.safe_load(f)
@@ -57,7 +67,8 @@ def load_sources(config_path: Optional[str] = None) -> List[SourceConfig]:
             sources.append(source)
         
         logger.info(f"Loaded {len(sources)} sources from {config_path}")
-        return sources
+        _sources_cache[config_path] = (mtime, sources)
+        return list(sources)
     except Exception as e:
         logger.error(f"Error loading sources: {e}")
         return []
@@ -6,12 +6,20 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-# Create engine
+_pool_kwargs = {}
+if not settings.database_url.startswith("sqlite"):
+    # SQLite picks its own pool class, which rejects QueuePool sizing options
+    _pool_kwargs.update(pool_size=10, max_overflow=20, pool_recycle=1800)
+
+# Create engine. pre-ping is skipped for freshly opened connections, so
+# one-shot scripts pay no extra round-trip; the server keeps stale-connection
+# protection.
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=settings.app_env == "development"
+    query_cache_size=1200,
+    echo=settings.app_env == "development",
+    **_pool_kwargs
 )
 
 # Create session factory
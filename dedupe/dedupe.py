@@ -1,6 +1,6 @@
 """Deduplication module for exact and near-duplicate detection."""
 import hashlib
-from typing import Optional, Set
+from typing import Dict, Optional, Set
 from simhash import Simhash
 import logging
 
@@ -20,35 +20,53 @@ class Deduper:
         self.simhash_threshold = simhash_threshold
         self.seen_hashes: Set[str] = set()
         self.seen_simhashes: Set[int] = set()
+        self._simhash_cache: Dict[str, int] = {}
     
-    def is_exact_duplicate(self, content: str) -> tuple[bool, str]:
+    def is_duplicate_by_hash(self, content_hash: str) -> bool:
         """
-        Check if content is an exact duplicate.
+        Check if a precomputed content hash has already been seen.
         
         Returns:
-            (is_duplicate, hash)
+            is_duplicate
         """
-        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
         is_duplicate = content_hash in self.seen_hashes
         
         if not is_duplicate:
             self.seen_hashes.add(content_hash)
         
-        return is_duplicate, content_hash
+        return is_duplicate
+    
+    def is_exact_duplicate(self, content: str) -> tuple[bool, str]:
+        """
+        Check if content is an exact duplicate.
+        
+        Returns:
+            (is_duplicate, hash)
+        """
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return self.is_duplicate_by_hash(content_hash), content_hash
     
-    def is_near_duplicate(self, content: str) -> tuple[bool, int]:
+    def is_near_duplicate(self, content: str, content_hash: Optional[str] = None) -> tuple[bool, int]:
         """
         Check if content is a near-duplicate using SimHash.
         
+        Args:
+            content: Content to check
+            content_hash: Optional content hash used to cache the SimHash value
+        
         Returns:
             (is_duplicate, simhash_value)
         """
-        # Generate SimHash
-        simhash_value = Simhash(content).value
+        # Generate SimHash (reuse the cached value for known content)
+        simhash_value = self._simhash_cache.get(content_hash) if content_hash else None
+        if simhash_value is None:
+            simhash_value = Simhash(content).value
+            if content_hash:
+                self._simhash_cache[content_hash] = simhash_value
         
-        # Check against existing SimHashes
+        # Check against existing SimHashes (Hamming distance)
         for existing_simhash in self.seen_simhashes:
-            distance = Simhash(content).distance(Simhash(value=existing_simhash))
+            distance = bin(simhash_value ^ existing_simhash).count("1")
             if distance <= self.simhash_threshold:
                 return True, simhash_value
         
@@ -56,25 +74,46 @@ class Deduper:
         self.seen_simhashes.add(simhash_value)
         return False, simhash_value
     
-    def is_duplicate(self, content: str) -> tuple[bool, Optional[str], Optional[int]]:
+    def is_duplicate(
+        self,
+        content: str,
+        content_hash: Optional[str] = None
+    ) -> tuple[bool, Optional[str], Optional[int]]:
         """
         Check if content is duplicate (exact or near).
         
+        Args:
+            content: Content to check
+            content_hash: Optional precomputed SHA-256 hex digest of `content`
+                (e.g. CrawlOut.text_hash); skips hashing the content again.
+                It must hash the same text, or exact matches are missed
+        
         Returns:
             (is_duplicate, exact_hash, simhash_value)
         """
-        is_exact, exact_hash = self.is_exact_duplicate(content)
+        if content_hash:
+            is_exact, exact_hash = self.is_duplicate_by_hash(content_hash), content_hash
+        else:
+            is_exact, exact_hash = self.is_exact_duplicate(content)
         if is_exact:
             return True, exact_hash, None
         
-        is_near, simhash_value = self.is_near_duplicate(content)
+        is_near, simhash_value = self.is_near_duplicate(content, exact_hash)
         if is_near:
             return True, exact_hash, simhash_value
         
         return False, exact_hash, simhash_value
     
+    def discard(self, content_hash: Optional[str], simhash_value: Optional[int] = None) -> None:
+        """Forget content recorded by is_duplicate (e.g. when storing it failed)."""
+        if content_hash:
+            self.seen_hashes.discard(content_hash)
+        if simhash_value is not None:
+            self.seen_simhashes.discard(simhash_value)
+    
     def reset(self):
         """Reset seen hashes (useful for testing)."""
         self.seen_hashes.clear()
         self.seen_simhashes.clear()
+        self._simhash_cache.clear()
 
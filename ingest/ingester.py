@@ -1,14 +1,17 @@
 """Document ingestion pipeline."""
 import logging
-from typing import List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 from database.models import Source, Document, DocVersion, Change, Opportunity, Subscriber
 from database.session import SessionLocal
-from tools.schemas import CrawlOut
+from tools.schemas import ChangeSummary, CrawlOut, OppExtract
 from dedupe.dedupe import Deduper
 from rag.store import RAGStore
 from rag.chunker import chunk_text
+from rag.worker import embed_and_store, get_embed_queue
 from agents.change_detector import ChangeDetector
 from agents.opportunity_extractor import OpportunityExtractor
 from agents.proposal_writer import ProposalWriter
@@ -17,15 +20,41 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    from ciso8601 import parse_datetime as _ciso_parse_datetime
+except ImportError:  # pragma: no cover - ciso8601 is optional
+    _ciso_parse_datetime = None
+
+# Documents shorter than five default-size chunks are used whole as proposal context
+DIRECT_CONTEXT_MAX_CHARS = 5 * 1000
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, using the ciso8601 C parser when installed."""
+    if not value:
+        return None
+    if _ciso_parse_datetime is not None:
+        return _ciso_parse_datetime(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 
 class Ingester:
     """Document ingestion pipeline."""
     
-    def __init__(self, db: Optional[Session] = None):
-        """Initialize ingester."""
+    def __init__(self, db: Optional[Session] = None, max_agent_workers: int = 10):
+        """
+        Initialize ingester.
+        
+        Args:
+            db: Database session
+            max_agent_workers: Maximum concurrent LLM agent calls per ingest
+        """
         self.db = db or SessionLocal()
+        self.max_agent_workers = max_agent_workers
+        self._rag_cache: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
         self.deduper = Deduper()
         self.rag_store = RAGStore()
+        self.embed_queue = get_embed_queue()
         self.change_detector = ChangeDetector()
         self.opportunity_extractor = OpportunityExtractor()
         self.proposal_writer = ProposalWriter()
@@ -43,140 +72,108 @@ class Ingester:
             Number of documents ingested
         """
         ingested_count = 0
+        self._rag_cache = {}
+        
+        # Preload existing documents and their latest versions for the whole batch
+        urls = [crawl_result.url for crawl_result in crawl_results]
+        existing_docs = {
+            (doc.url, doc.http_hash): doc
+            for doc in self.db.query(Document).filter(Document.url.in_(urls)).all()
+        }
+        latest_versions = self._load_latest_versions([doc.id for doc in existing_docs.values()])
         
+        # Filter out duplicates and unchanged documents
+        pending = []
+        new_opportunities = []
         for crawl_result in crawl_results:
             try:
-                # Check for duplicates
-                is_duplicate, exact_hash, _ = self.deduper.is_duplicate(crawl_result.raw_text or "")
+                raw_text = crawl_result.raw_text or ""
+                
+                # Check for duplicates. http_hash may cover HTML markup or PDF
+                # bytes, so only a hash of the text itself skips rehashing
+                is_duplicate, exact_hash, simhash_value = self.deduper.is_duplicate(
+                    raw_text,
+                    content_hash=crawl_result.text_hash
+                )
                 
                 if is_duplicate:
                     logger.info(f"Skipping duplicate document: {crawl_result.url}")
                     continue
                 
                 # Check if document exists with same hash
-                existing_doc = self.db.query(Document).filter(
-                    Document.http_hash == crawl_result.http_hash,
-                    Document.url == crawl_result.url
-                ).first()
+                existing_doc = existing_docs.get((crawl_result.url, crawl_result.http_hash))
+                latest_version = latest_versions.get(existing_doc.id) if existing_doc else None
                 
-                if existing_doc:
-                    # Check if content changed
-                    latest_version = self.db.query(DocVersion).filter(
-                        DocVersion.doc_id == existing_doc.id
-                    ).order_by(DocVersion.version.desc()).first()
-                    
-                    if latest_version and latest_version.text == (crawl_result.raw_text or ""):
-                        logger.info(f"Document unchanged: {crawl_result.url}")
-                        continue
-                    
-                    # Create new version
-                    new_version_num = (latest_version.version if latest_version else 0) + 1
-                    new_version = DocVersion(
-                        doc_id=existing_doc.id,
-                        version=new_version_num,
-                        text=crawl_result.raw_text or ""
-                    )
-                    self.db.add(new_version)
-                    
-                    # Detect changes
-                    old_text = latest_version.text if latest_version else ""
-                    change_summary = self.change_detector.detect_changes(
-                        url=crawl_result.url,
-                        fetched_at=crawl_result.fetched_at,
-                        old_text=old_text,
-                        new_text=crawl_result.raw_text or ""
-                    )
-                    
-                    if change_summary.what_changed:
-                        change = Change(
-                            doc_id=existing_doc.id,
-                            old_version=(latest_version.version if latest_version else 0),
-                            new_version=new_version_num,
-                            summary_json=change_summary.model_dump_json()
-                        )
-                        self.db.add(change)
-                    
-                    # Update document
-                    existing_doc.fetched_at = datetime.fromisoformat(crawl_result.fetched_at.replace('Z', '+00:00'))
-                    existing_doc.http_hash = crawl_result.http_hash
-                    existing_doc.raw_text = crawl_result.raw_text
-                    
-                    doc = existing_doc
-                else:
-                    # Create new document
-                    doc = Document(
-                        source_id=source_id,
-                        url=crawl_result.url,
-                        title=crawl_result.title,
-                        fetched_at=datetime.fromisoformat(crawl_result.fetched_at.replace('Z', '+00:00')),
-                        http_hash=crawl_result.http_hash,
-                        mime=crawl_result.mime,
-                        raw_text=crawl_result.raw_text
-                    )
-                    self.db.add(doc)
-                    self.db.flush()
-                    
-                    # Create initial version
-                    version = DocVersion(
-                        doc_id=doc.id,
-                        version=1,
-                        text=crawl_result.raw_text or ""
-                    )
-                    self.db.add(version)
+                # Check if content changed
+                if latest_version and latest_version.text == raw_text:
+                    logger.info(f"Document unchanged: {crawl_result.url}")
+                    continue
                 
-                # Extract opportunities
-                opportunities = self.opportunity_extractor.extract_opportunities(
-                    url=crawl_result.url,
-                    title=crawl_result.title,
-                    text=crawl_result.raw_text or ""
-                )
+                pending.append((crawl_result, raw_text, existing_doc, latest_version, exact_hash, simhash_value))
+            except Exception as e:
+                logger.error(f"Error ingesting document {crawl_result.url}: {e}")
+                continue
+        
+        # LLM calls are network-bound: run them concurrently, write to the DB serially
+        with ThreadPoolExecutor(max_workers=self.max_agent_workers) as executor:
+            agent_futures = [
+                self._submit_agent_calls(executor, crawl_result, raw_text, existing_doc, latest_version)
+                for crawl_result, raw_text, existing_doc, latest_version, _, _ in pending
+            ]
+            
+            for (crawl_result, raw_text, existing_doc, latest_version, exact_hash, simhash_value), (change_future, opp_future) in zip(pending, agent_futures):
+                # Agent results are fetched before the savepoint so it only covers DB writes
+                try:
+                    change_summary = change_future.result() if change_future else None
+                    opportunities = opp_future.result()
+                except Exception as e:
+                    self.deduper.discard(exact_hash, simhash_value)
+                    logger.error(f"Error ingesting document {crawl_result.url}: {e}")
+                    continue
                 
-                for opp in opportunities:
-                    if opp.title and opp.url:
-                        # Parse deadline if present
-                        deadline = None
-                        if opp.deadline:
-                            try:
-                                deadline = datetime.fromisoformat(opp.deadline.replace('Z', '+00:00'))
-                            except Exception:
-                                pass
-                        
-                        opportunity = Opportunity(
-                            doc_id=doc.id,
-                            title=opp.title,
-                            deadline=deadline,
-                            eligibility=opp.eligibility,
-                            amount=opp.amount,
-                            agency=opp.agency,
-                            url=opp.url,
-                            score=0.0  # Can be updated by ranking
+                doc_opportunities = []
+                try:
+                    # One SAVEPOINT per document: a failing row only discards its own writes
+                    with self.db.begin_nested():
+                        doc = self._write_document(
+                            source_id, crawl_result, raw_text, existing_doc, latest_version,
+                            change_summary, opportunities, doc_opportunities
                         )
-                        self.db.add(opportunity)
-                        self.db.flush()  # Flush to get opportunity.id
-                        
-                        # Automatically generate and send proposal to active subscribers
-                        if settings.enable_auto_proposal_sending:
-                            try:
-                                self._send_proposal_to_subscribers(opportunity, doc)
-                            except Exception as e:
-                                logger.error(f"Error sending proposal for opportunity {opp.title}: {e}", exc_info=True)
+                except Exception as e:
+                    self.deduper.discard(exact_hash, simhash_value)
+                    logger.error(f"Error ingesting document {crawl_result.url}: {e}")
+                    continue
+                
+                new_opportunities.extend((opportunity, doc) for opportunity in doc_opportunities)
                 
                 # Chunk and add to RAG store
-                if crawl_result.raw_text:
+                if raw_text:
                     chunks = chunk_text(
-                        text=crawl_result.raw_text,
+                        text=raw_text,
                         url=crawl_result.url,
                         title=crawl_result.title
                     )
                     if chunks:
-                        self.rag_store.add_documents(chunks)
+                        self.rag_store.add_documents_deferred(chunks)
                 
                 ingested_count += 1
                 logger.info(f"Ingested document: {crawl_result.url}")
-                
-            except Exception as e:
-                logger.error(f"Error ingesting document {crawl_result.url}: {e}")
-                continue
+        
+        # Embed all chunks from this run in a single batch; with a queue
+        # configured, embedding is handed to a worker after the commit
+        queued_chunks = []
+        if self.embed_queue is not None:
+            queued_chunks = self.rag_store.take_pending()
+        else:
+            self.rag_store.flush()
+        
+        # Automatically generate and send proposals to active subscribers
+        if settings.enable_auto_proposal_sending:
+            for opportunity, doc in new_opportunities:
+                try:
+                    self._send_proposal_to_subscribers(opportunity, doc)
+                except Exception as e:
+                    logger.error(f"Error sending proposal for opportunity {opportunity.title}: {e}", exc_info=True)
         
         try:
             self.db.commit()
@@ -186,8 +183,190 @@ class Ingester:
             logger.error(f"Error committing ingestion: {e}")
             raise
         
+        if queued_chunks:
+            try:
+                self.embed_queue.enqueue(embed_and_store, queued_chunks)
+                logger.info(f"Queued {len(queued_chunks)} chunks for embedding")
+            except Exception as e:
+                logger.error(f"Error queueing chunks for embedding, embedding in-process: {e}")
+                self.rag_store.add_documents(queued_chunks)
+        
         return ingested_count
     
+    def _write_document(
+        self,
+        source_id: int,
+        crawl_result: CrawlOut,
+        raw_text: str,
+        existing_doc: Optional[Document],
+        latest_version: Optional[DocVersion],
+        change_summary: Optional[ChangeSummary],
+        opportunities: List[OppExtract],
+        new_opportunities: List[Opportunity]
+    ) -> Document:
+        """
+        Add the document, its new version, change record and opportunities.
+        
+        Added opportunities are appended to `new_opportunities`.
+        
+        Returns:
+            The new or updated document
+        """
+        if existing_doc:
+            # Create new version
+            new_version_num = (latest_version.version if latest_version else 0) + 1
+            new_version = DocVersion(
+                doc_id=existing_doc.id,
+                version=new_version_num,
+                text=raw_text
+            )
+            self.db.add(new_version)
+            
+            if change_summary and change_summary.what_changed:
+                change = Change(
+                    doc_id=existing_doc.id,
+                    old_version=(latest_version.version if latest_version else 0),
+                    new_version=new_version_num,
+                    summary_json=change_summary.model_dump_json()
+                )
+                self.db.add(change)
+            
+            # Update document
+            existing_doc.fetched_at = _parse_iso(crawl_result.fetched_at)
+            existing_doc.http_hash = crawl_result.http_hash
+            existing_doc.raw_text = crawl_result.raw_text
+            
+            doc = existing_doc
+        else:
+            # Create new document
+            doc = Document(
+                source_id=source_id,
+                url=crawl_result.url,
+                title=crawl_result.title,
+                fetched_at=_parse_iso(crawl_result.fetched_at),
+                http_hash=crawl_result.http_hash,
+                mime=crawl_result.mime,
+                raw_text=crawl_result.raw_text
+            )
+            self.db.add(doc)
+            
+            # Create initial version
+            version = DocVersion(
+                document=doc,
+                version=1,
+                text=raw_text
+            )
+            self.db.add(version)
+        
+        for opp in opportunities:
+            if opp.title and opp.url:
+                # Parse deadline if present
+                deadline = None
+                try:
+                    deadline = _parse_iso(opp.deadline)
+                except Exception:
+                    pass
+                
+                opportunity = Opportunity(
+                    document=doc,
+                    title=opp.title,
+                    deadline=deadline,
+                    eligibility=opp.eligibility,
+                    amount=opp.amount,
+                    agency=opp.agency,
+                    url=opp.url,
+                    score=0.0  # Can be updated by ranking
+                )
+                self.db.add(opportunity)
+                new_opportunities.append(opportunity)
+        
+        return doc
+    
+    def _submit_agent_calls(
+        self,
+        executor: ThreadPoolExecutor,
+        crawl_result: CrawlOut,
+        raw_text: str,
+        existing_doc: Optional[Document],
+        latest_version: Optional[DocVersion]
+    ) -> Tuple[Optional[Future], Future]:
+        """
+        Submit change detection and opportunity extraction for a document.
+        
+        Returns:
+            (change_future, opportunities_future); change_future is None for new documents
+        """
+        change_future = None
+        if existing_doc:
+            change_future = executor.submit(
+                self.change_detector.detect_changes,
+                url=crawl_result.url,
+                fetched_at=crawl_result.fetched_at,
+                old_text=latest_version.text if latest_version else "",
+                new_text=raw_text
+            )
+        
+        opp_future = executor.submit(
+            self.opportunity_extractor.extract_opportunities,
+            url=crawl_result.url,
+            title=crawl_result.title,
+            text=raw_text
+        )
+        return change_future, opp_future
+    
+    def _load_latest_versions(self, doc_ids: List[int]) -> Dict[int, DocVersion]:
+        """
+        Load the latest DocVersion for each document in a single query.
+        
+        Args:
+            doc_ids: Document IDs
+        
+        Returns:
+            Mapping of document ID to its latest version
+        """
+        if not doc_ids:
+            return {}
+        
+        latest = self.db.query(
+            DocVersion.doc_id,
+            func.max(DocVersion.version).label("version")
+        ).filter(
+            DocVersion.doc_id.in_(doc_ids)
+        ).group_by(DocVersion.doc_id).subquery()
+        
+        versions = self.db.query(DocVersion).join(
+            latest,
+            and_(DocVersion.doc_id == latest.c.doc_id, DocVersion.version == latest.c.version)
+        ).all()
+        
+        return {version.doc_id: version for version in versions}
+    
+    def _chunks_from_document(self, document: Document) -> List[Dict[str, Any]]:
+        """
+        Chunk a document's text directly, in the same format as RAG query results.
+        
+        Args:
+            document: The source document
+        
+        Returns:
+            Up to five chunks from the start of the document
+        """
+        chunks_from_doc = chunk_text(
+            text=document.raw_text,
+            url=document.url,
+            title=document.title
+        )
+        return [
+            {
+                "text": chunk.get("text", ""),
+                "url": chunk.get("url", document.url),
+                "title": chunk.get("title", document.title),
+                "heading": chunk.get("heading", ""),
+                "metadata": {}
+            }
+            for chunk in chunks_from_doc[:5]  # Limit to top 5
+        ]
+    
     def _send_proposal_to_subscribers(self, opportunity: Opportunity, document: Document):
         """
         Generate and send proposal text to all active subscribers.
@@ -207,28 +386,21 @@ class Ingester:
                 logger.debug("No active subscribers to send proposal to")
                 return
             
-            # Get RAG chunks for the opportunity
-            chunks = self.rag_store.query(opportunity.title, top_k=5)
-            
-            # Fallback: if no RAG chunks found, create chunks from document text
-            if not chunks and document.raw_text:
-                logger.info(f"No RAG chunks found, creating chunks from document text for: {opportunity.title}")
-                chunks_from_doc = chunk_text(
-                    text=document.raw_text,
-                    url=document.url,
-                    title=document.title
-                )
-                # Convert chunk format to match RAG query results
-                chunks = [
-                    {
-                        "text": chunk.get("text", ""),
-                        "url": chunk.get("url", document.url),
-                        "title": chunk.get("title", document.title),
-                        "heading": chunk.get("heading", ""),
-                        "metadata": {}
-                    }
-                    for chunk in chunks_from_doc[:5]  # Limit to top 5
-                ]
+            if document.raw_text and len(document.raw_text) < DIRECT_CONTEXT_MAX_CHARS:
+                # Small documents fit entirely in the proposal context; skip retrieval
+                chunks = self._chunks_from_document(document)
+            else:
+                # Get RAG chunks for the opportunity (cached for this ingest run)
+                cache_key = (document.id, opportunity.title)
+                chunks = self._rag_cache.get(cache_key)
+                if chunks is None:
+                    chunks = self.rag_store.query(opportunity.title, top_k=5)
+                    self._rag_cache[cache_key] = chunks
+                
+                # Fallback: if no RAG chunks found, create chunks from document text
+                if not chunks and document.raw_text:
+                    logger.info(f"No RAG chunks found, creating chunks from document text for: {opportunity.title}")
+                    chunks = self._chunks_from_document(document)
             
             if not chunks:
                 logger.warning(f"No chunks available for proposal generation: {opportunity.title}")
@@ -244,22 +416,19 @@ class Ingester:
                 chunks=chunks
             )
             
-            # Send to all active subscribers
+            # Send to all active subscribers (concurrently where the sender supports it)
+            results = self.whatsapp_sender.send_proposal_text_many(
+                recipients=[subscriber.handle for subscriber in subscribers],
+                proposal_text=proposal_text,
+                opportunity_title=opportunity.title
+            )
             sent_count = 0
-            for subscriber in subscribers:
-                try:
-                    success = self.whatsapp_sender.send_proposal_text(
-                        to=subscriber.handle,
-                        proposal_text=proposal_text,
-                        opportunity_title=opportunity.title
-                    )
-                    if success:
-                        sent_count += 1
-                        logger.info(f"Sent proposal for '{opportunity.title}' to subscriber {subscriber.handle}")
-                    else:
-                        logger.warning(f"Failed to send proposal to subscriber {subscriber.handle}")
-                except Exception as e:
-                    logger.error(f"Error sending proposal to subscriber {subscriber.handle}: {e}", exc_info=True)
+            for subscriber, success in zip(subscribers, results):
+                if success:
+                    sent_count += 1
+                    logger.info(f"Sent proposal for '{opportunity.title}' to subscriber {subscriber.handle}")
+                else:
+                    logger.warning(f"Failed to send proposal to subscriber {subscriber.handle}")
             
             logger.info(f"Sent proposal for '{opportunity.title}' to {sent_count}/{len(subscribers)} subscribers")
             
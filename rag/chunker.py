@@ -1,10 +1,126 @@
 """Text chunking for RAG."""
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
+import itertools
 import re
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Use the linear-time RE2 engine when installed (drop-in for this pattern)
+try:
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+# Markdown headings (h1-h6)
+HEADING_RE = _regex_engine.compile(r'(?m)(^#{1,6}\s+.+$)')
+
+
+def _iter_sections(text: str) -> Iterator[Tuple[Optional[str], str]]:
+    """Yield (heading, text) sections split on markdown headings."""
+    last_pos = 0
+    for match in HEADING_RE.finditer(text):
+        if match.start() > last_pos:
+            yield None, text[last_pos:match.start()].strip()
+        yield match.group(1), match.group(1)
+        last_pos = match.end()
+    
+    # Remaining text
+    if last_pos < len(text):
+        yield None, text[last_pos:].strip()
+
+
+def _pack_paragraphs(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """
+    Pack blank-line separated paragraphs into chunk texts.
+    
+    Specialized path for text without headings: there is no heading to
+    track and paragraphs are never empty.
+    """
+    chunk_texts: List[str] = []
+    buf: List[str] = []
+    buf_len = 0
+    
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        
+        if buf and buf_len + len(paragraph) > chunk_size:
+            current_chunk = "\n\n".join(buf)
+            chunk_texts.append(current_chunk.strip())
+            
+            # Start new chunk with overlap
+            if chunk_overlap > 0:
+                overlap_text = current_chunk[-chunk_overlap:]
+                buf = [overlap_text, paragraph]
+                buf_len = len(overlap_text) + 2 + len(paragraph)
+            else:
+                buf = [paragraph]
+                buf_len = len(paragraph)
+        else:
+            buf.append(paragraph)
+            buf_len += len(paragraph) + 2 if buf_len else len(paragraph)
+    
+    if buf:
+        chunk_texts.append("\n\n".join(buf).strip())
+    
+    return chunk_texts
+
+
+def _pack_sections(
+    sections: Iterator[Tuple[Optional[str], str]],
+    chunk_size: int,
+    chunk_overlap: int
+) -> Tuple[List[str], List[Optional[str]]]:
+    """Pack (heading, text) sections into chunk texts and their headings."""
+    # buf_len tracks len("\n\n".join(buf))
+    chunk_texts: List[str] = []
+    chunk_headings: List[Optional[str]] = []
+    buf: List[str] = []
+    buf_len = 0
+    current_heading = None
+    
+    for section_heading, section_text in sections:
+        if section_heading:
+            current_heading = section_heading
+        
+        # If adding this section would exceed chunk size, finalize current chunk
+        if buf_len and buf_len + len(section_text) > chunk_size:
+            current_chunk = "\n\n".join(buf)
+            chunk_texts.append(current_chunk.strip())
+            chunk_headings.append(current_heading)
+            
+            # Start new chunk with overlap
+            if chunk_overlap > 0:
+                overlap_text = current_chunk[-chunk_overlap:]
+                buf = [overlap_text, section_text]
+                buf_len = len(overlap_text) + 2 + len(section_text)
+            else:
+                buf = [section_text]
+                buf_len = len(section_text)
+        elif buf_len:
+            buf.append(section_text)
+            buf_len += 2 + len(section_text)
+        else:
+            buf = [section_text]
+            buf_len = len(section_text)
+    
+    # Add final chunk
+    if buf_len:
+        chunk_texts.append("\n\n".join(buf).strip())
+        chunk_headings.append(current_heading)
+    
+    return chunk_texts, chunk_headings
+
+
+def _split_windows(text: str, size: int, overlap: int) -> List[str]:
+    """Split text into `size`-character windows overlapping by `overlap`."""
+    step = size - overlap if overlap < size else size
+    # Window starts stop at the first window that reaches the end of the text
+    stop = max(len(text) - size, 0) + step
+    return [text[i:i + size] for i in range(0, stop, step)]
+
 
 def chunk_text(
     text: str,
@@ -24,126 +140,50 @@ def chunk_text(
         chunk_overlap: Overlap between chunks
     
     Returns:
-        List of chunks with metadata
+        List of chunks with metadata. Chunks with the same heading share
+        one metadata dict, so callers must not mutate it in place.
     """
     if not text:
         return []
     
-    # Split by headings (h1-h6 patterns)
-    heading_pattern = re.compile(r'(^#{1,6}\s+.+$)', re.MULTILINE)
-    sections = []
-    last_pos = 0
-    
-    for match in heading_pattern.finditer(text):
-        if match.start() > last_pos:
-            sections.append({
-                "heading": None,
-                "text": text[last_pos:match.start()].strip(),
-                "start": last_pos
-            })
-        sections.append({
-            "heading": match.group(1),
-            "text": match.group(1),
-            "start": match.start()
-        })
-        last_pos = match.end()
-    
-    # Add remaining text
-    if last_pos < len(text):
-        sections.append({
-            "heading": None,
-            "text": text[last_pos:].strip(),
-            "start": last_pos
-        })
-    
-    # If no headings found, split by paragraphs
-    if len(sections) == 1:
-        paragraphs = text.split("\n\n")
-        sections = [{"heading": None, "text": p.strip(), "start": 0} for p in paragraphs if p.strip()]
-    
-    # Create chunks with overlap
-    chunks = []
-    current_chunk = ""
-    current_heading = None
-    
-    for section in sections:
-        section_text = section["text"]
-        section_heading = section["heading"]
-        
-        if section_heading:
-            current_heading = section_heading
-        
-        # If adding this section would exceed chunk size, finalize current chunk
-        if current_chunk and len(current_chunk) + len(section_text) > chunk_size:
-            if current_chunk:
-                chunks.append({
-                    "text": current_chunk.strip(),
-                    "url": url,
-                    "title": title,
-                    "heading": current_heading,
-                    "metadata": {
-                        "url": url,
-                        "title": title,
-                        "heading": current_heading or ""
-                    }
-                })
-            
-            # Start new chunk with overlap
-            if chunk_overlap > 0 and current_chunk:
-                overlap_text = current_chunk[-chunk_overlap:]
-                current_chunk = overlap_text + "\n\n" + section_text
-            else:
-                current_chunk = section_text
-        else:
-            if current_chunk:
-                current_chunk += "\n\n" + section_text
-            else:
-                current_chunk = section_text
+    # Split by headings; if no headings found, split by paragraphs
+    sections = _iter_sections(text)
+    head = list(itertools.islice(sections, 2))
+    if len(head) < 2:
+        chunk_texts = _pack_paragraphs(text, chunk_size, chunk_overlap)
+        chunk_headings: List[Optional[str]] = [None] * len(chunk_texts)
+    else:
+        chunk_texts, chunk_headings = _pack_sections(
+            itertools.chain(head, sections), chunk_size, chunk_overlap
+        )
     
-    # Add final chunk
-    if current_chunk:
-        chunks.append({
-            "text": current_chunk.strip(),
-            "url": url,
-            "title": title,
-            "heading": current_heading,
-            "metadata": {
+
+    # Build chunk dicts, splitting oversized chunks to the size limit
+    metadata_by_heading: Dict[Optional[str], Dict[str, str]] = {}
+    final_chunks = []
+    for chunk_body, heading in zip(chunk_texts, chunk_headings):
+        metadata = metadata_by_heading.get(heading)
+        if metadata is None:
+            metadata = metadata_by_heading[heading] = {
                 "url": url,
                 "title": title,
-                "heading": current_heading or ""
+                "heading": heading or ""
             }
-        })
-    
-    # Ensure chunks are within size limit
-    final_chunks = []
-    for chunk in chunks:
-        if len(chunk["text"]) <= chunk_size:
-            final_chunks.append(chunk)
+        
+        if len(chunk_body) <= chunk_size:
+            windows = [chunk_body]
         else:
-            # Split oversized chunks
-            words = chunk["text"].split()
-            current_text = ""
-            for word in words:
-                if len(current_text) + len(word) + 1 <= chunk_size:
-                    current_text += (" " if current_text else "") + word
-                else:
-                    if current_text:
-                        final_chunks.append({
-                            "text": current_text,
-                            "url": url,
-                            "title": title,
-                            "heading": chunk["heading"],
-                            "metadata": chunk["metadata"]
-                        })
-                    current_text = word
-            if current_text:
-                final_chunks.append({
-                    "text": current_text,
-                    "url": url,
-                    "title": title,
-                    "heading": chunk["heading"],
-                    "metadata": chunk["metadata"]
-                })
+            # Split oversized chunks into overlapping character windows
+            windows = _split_windows(chunk_body, chunk_size, chunk_overlap)
+        
+        for window in windows:
+            final_chunks.append({
+                "text": window,
+                "url": url,
+                "title": title,
+                "heading": heading,
+                "metadata": metadata
+            })
     
     logger.info(f"Created {len(final_chunks)} chunks from text (length: {len(text)})")
     return final_chunks
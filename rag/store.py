@@ -1,8 +1,12 @@
 """RAG store using Chroma (with interface for pgvector)."""
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+from collections import OrderedDict
+from hashlib import blake2b
 import chromadb
 from chromadb.config import Settings
 import logging
+import threading
+from pathlib import Path
 import httpx
 from config import settings
 
@@ -25,16 +29,93 @@ if _use_local_embeddings:
 else:
     _sentence_transformers_available = False
 
+# Optional INT8-quantized ONNX Runtime backend for local embeddings
+if _use_local_embeddings and settings.embedding_backend == "onnx-int8":
+    try:
+        import numpy as np
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        _onnx_available = True
+    except ImportError:
+        _onnx_available = False
+        logger.warning("optimum/onnxruntime not available, falling back to sentence-transformers")
+else:
+    _onnx_available = False
+
+
+class _OnnxEmbeddingModel:
+    """INT8-quantized ONNX Runtime encoder with a SentenceTransformer-like encode()."""
+    
+    def __init__(self, model_name: str):
+        """Export and quantize the model on first use, then load it."""
+        export_dir = Path(settings.storage_dir) / "onnx" / model_name.replace("/", "__")
+        quantized_file = "model_quantized.onnx"
+        
+        if not (export_dir / quantized_file).exists():
+            logger.info(f"Exporting {model_name} to ONNX and quantizing to INT8")
+            model = ORTModelForFeatureExtraction.from_pretrained(
+                model_name, export=True, provider="CPUExecutionProvider"
+            )
+            model.save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(export_dir)
+            quantize_dynamic(
+                model_input=str(export_dir / "model.onnx"),
+                model_output=str(export_dir / quantized_file),
+                weight_type=QuantType.QInt8
+            )
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            export_dir, file_name=quantized_file, provider="CPUExecutionProvider"
+        )
+    
+    def encode(self, texts: List[str], batch_size: int = 64, show_progress_bar: bool = False):
+        """Encode texts with mean pooling and L2 normalization."""
+        # Batch texts of similar length together to minimise padding
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        sorted_texts = [texts[i] for i in order]
+        
+        batches = []
+        for start in range(0, len(sorted_texts), batch_size):
+            encoded = self.tokenizer(
+                sorted_texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors="np"
+            )
+            token_embeddings = self.model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled)
+        
+        # Restore the caller's order
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.concatenate(batches)
+        return embeddings
+
+
+# Query embeddings shared by every EmbeddingClient, keyed by (model, query)
+QUERY_CACHE_SIZE = 1024
+_query_cache: "OrderedDict[Tuple[str, str], Tuple[float, ...]]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
 
 class EmbeddingClient:
     """Client for generating embeddings locally or remotely."""
     
+    # One pooled HTTP/2 connection to the embedding service for the process
+    _http_client: Optional[httpx.Client] = None
+    _http_client_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize embedding client."""
         self.provider = settings.embedding_provider
         self.service_url = settings.embedding_service_url
         self.api_key = settings.embedding_service_api_key
         self.local_model = None
+        self._model_key = f"{self.provider}:{self.service_url}:{settings.embedding_model}"
         
         # Determine if we should use local or remote
         # Backward compatible: "sentence_transformers" (default) uses local mode
@@ -43,7 +124,15 @@ class EmbeddingClient:
             (not self.service_url and self.provider != "remote")
         )
         
-        if use_local and _sentence_transformers_available:
+        if use_local and _onnx_available:
+            try:
+                self.local_model = _OnnxEmbeddingModel(settings.embedding_model)
+            except Exception as e:
+                logger.warning(f"Failed to load ONNX embedding model, falling back to sentence-transformers: {e}")
+        
+        if self.local_model is not None:
+            logger.info(f"Initialized ONNX INT8 embedding model: {settings.embedding_model}")
+        elif use_local and _sentence_transformers_available:
             try:
                 self.local_model = SentenceTransformer(settings.embedding_model)
                 logger.info(f"Initialized local embedding model: {settings.embedding_model}")
@@ -71,10 +160,64 @@ class EmbeddingClient:
             return []
         
         if self.local_model:
-            return self.local_model.encode(texts, show_progress_bar=False).tolist()
+            return self.local_model.encode(texts, batch_size=64, show_progress_bar=False).tolist()
         else:
             return self._encode_remote(texts)
     
+    @classmethod
+    def _get_http_client(cls) -> httpx.Client:
+        """Return the shared HTTP client, creating it on first use."""
+        with cls._http_client_lock:
+            if cls._http_client is None:
+                cls._http_client = httpx.Client(
+                    http2=True,
+                    timeout=30.0,
+                    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+                )
+            return cls._http_client
+    
+    @classmethod
+    def close(cls) -> None:
+        """Close the shared HTTP client used for the remote embedding service."""
+        with cls._http_client_lock:
+            if cls._http_client is not None:
+                cls._http_client.close()
+                cls._http_client = None
+    
+    def encode_query(self, text: str) -> List[float]:
+        """
+        Generate the embedding for a single query, reusing cached results.
+        
+        Args:
+            text: Query text
+            
+        Returns:
+            Embedding vector, or an empty list on failure
+        """
+        key = (self._model_key, text)
+        with _query_cache_lock:
+            embedding = _query_cache.get(key)
+            if embedding is not None:
+                _query_cache.move_to_end(key)
+                return list(embedding)
+        
+        embeddings = self.encode([text])
+        if not embeddings:
+            # Failures are not cached
+            return []
+        
+        with _query_cache_lock:
+            _query_cache[key] = tuple(embeddings[0])
+            while len(_query_cache) > QUERY_CACHE_SIZE:
+                _query_cache.popitem(last=False)
+        return list(embeddings[0])
+    
+    @staticmethod
+    def clear_query_cache() -> None:
+        """Drop cached query embeddings (e.g. after swapping the model)."""
+        with _query_cache_lock:
+            _query_cache.clear()
+    
     def _encode_remote(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings via remote service."""
         try:
@@ -85,11 +228,10 @@ class EmbeddingClient:
             
             payload = {"texts": texts}
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                result = response.json()
-                return result.get("embeddings", [])
+            response = self._get_http_client().post(url, json=payload, headers=headers)
+            response.raise_for_status()
+            result = response.json()
+            return result.get("embeddings", [])
         except httpx.HTTPError as e:
             logger.error(f"HTTP error calling embedding service: {e}")
             return []
@@ -98,6 +240,28 @@ class EmbeddingClient:
             return []
 
 
+def _chunk_ids(chunks: List[Dict[str, Any]]) -> List[str]:
+    """
+    Build stable chunk IDs from the URL, the chunk position and the chunk text.
+    
+    IDs are identical across runs for unchanged content, so re-ingesting a
+    document does not duplicate its chunks.
+    """
+    url_tags: Dict[str, str] = {}
+    positions: Dict[str, int] = {}
+    ids = []
+    for chunk in chunks:
+        url = chunk["url"]
+        url_tag = url_tags.get(url)
+        if url_tag is None:
+            url_tag = url_tags[url] = blake2b(url.encode("utf-8"), digest_size=8).hexdigest()
+        position = positions.get(url, 0)
+        positions[url] = position + 1
+        text_tag = blake2b(chunk["text"].encode("utf-8"), digest_size=8).hexdigest()
+        ids.append(f"{url_tag}_{position}_{text_tag}")
+    return ids
+
+
 class RAGStore:
     """RAG store using ChromaDB."""
     
@@ -114,6 +278,7 @@ class RAGStore:
             name="nigerian_grants",
             metadata={"hnsw:space": "cosine"}
         )
+        self._pending_chunks: List[Dict[str, Any]] = []
         logger.info(f"Initialized RAG store with collection: nigerian_grants")
     
     def add_documents(self, chunks: List[Dict[str, Any]]) -> bool:
@@ -129,7 +294,54 @@ class RAGStore:
         if not chunks:
             return False
         
+        self.add_documents_deferred(chunks)
+        return self.flush()
+    
+    def add_documents_deferred(self, chunks: List[Dict[str, Any]]) -> None:
+        """
+        Queue document chunks to be embedded on the next flush().
+        
+        Args:
+            chunks: List of chunks with text, url, title, metadata
+        """
+        if chunks:
+            self._pending_chunks.extend(chunks)
+    
+    def take_pending(self) -> List[Dict[str, Any]]:
+        """
+        Remove and return the chunks queued by add_documents_deferred().
+        
+        Returns:
+            Pending chunks
+        """
+        chunks = self._pending_chunks
+        self._pending_chunks = []
+        return chunks
+    
+    def flush(self) -> bool:
+        """
+        Embed all pending chunks in one batch and add them to the store.
+        
+        Returns:
+            Success status
+        """
+        if not self._pending_chunks:
+            return False
+        
+        chunks = self.take_pending()
+        
         try:
+            # Skip chunks that are already stored
+            ids = _chunk_ids(chunks)
+            existing_ids = set(self.collection.get(ids=ids, include=[])["ids"])
+            if existing_ids:
+                new_chunks = [(chunk_id, chunk) for chunk_id, chunk in zip(ids, chunks) if chunk_id not in existing_ids]
+                if not new_chunks:
+                    logger.info(f"All {len(chunks)} chunks already in RAG store")
+                    return True
+                ids = [chunk_id for chunk_id, _ in new_chunks]
+                chunks = [chunk for _, chunk in new_chunks]
+            
             texts = [chunk["text"] for chunk in chunks]
             embeddings = self.embedding_client.encode(texts)
             
@@ -137,16 +349,17 @@ class RAGStore:
                 logger.error("Failed to generate embeddings")
                 return False
             
-            ids = [f"chunk_{i}_{hash(chunk['url'])}" for i, chunk in enumerate(chunks)]
-            metadatas = [
-                {
+            metadatas = []
+            for chunk in chunks:
+                metadata = {
                     "url": chunk.get("url", ""),
                     "title": chunk.get("title", ""),
-                    "heading": chunk.get("heading", ""),
-                    **chunk.get("metadata", {})
+                    "heading": chunk.get("heading") or ""
                 }
-                for chunk in chunks
-            ]
+                chunk_metadata = chunk.get("metadata")
+                if chunk_metadata:
+                    metadata.update(chunk_metadata)
+                metadatas.append(metadata)
             
             self.collection.add(
                 embeddings=embeddings,
@@ -174,11 +387,10 @@ class RAGStore:
             List of relevant chunks with scores
         """
         try:
-            query_embeddings = self.embedding_client.encode([query])
-            if not query_embeddings:
+            query_embedding = self.embedding_client.encode_query(query)
+            if not query_embedding:
                 logger.error("Failed to generate query embedding")
                 return []
-            query_embedding = query_embeddings[0]
             
             where = filters or {}
             results = self.collection.query(
@@ -0,0 +1,51 @@
+"""Background embedding of RAG chunks via an RQ worker.
+
+Run a worker with:
+    rq worker rag-embeddings --url $RAG_QUEUE_REDIS_URL
+"""
+import logging
+from typing import Any, Dict, List, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUE_NAME = "rag-embeddings"
+
+try:
+    from redis import Redis
+    from rq import Queue
+    _rq_available = True
+except ImportError:  # pragma: no cover - rq optional for in-process embedding
+    _rq_available = False
+
+# RAGStore is created once per worker process and reused across jobs
+_rag_store = None
+
+
+def embed_and_store(chunks: List[Dict[str, Any]]) -> bool:
+    """
+    Embed chunks and add them to the RAG store (runs on the worker).
+    
+    Args:
+        chunks: List of chunks with text, url, title, metadata
+    
+    Returns:
+        Success status
+    """
+    global _rag_store
+    if _rag_store is None:
+        from rag.store import RAGStore
+        _rag_store = RAGStore()
+    return _rag_store.add_documents(chunks)
+
+
+def get_embed_queue() -> Optional["Queue"]:
+    """Return the embedding queue, or None to embed in-process."""
+    if not settings.rag_queue_redis_url:
+        return None
+    
+    if not _rq_available:
+        logger.warning("RAG_QUEUE_REDIS_URL is set but rq is not installed, embedding in-process")
+        return None
+    
+    return Queue(QUEUE_NAME, connection=Redis.from_url(settings.rag_queue_redis_url))
@@ -1,60 +1,56 @@
 """Cron scheduler for automated crawling."""
 import logging
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from config import settings
-import requests
 
 logger = logging.getLogger(__name__)
 
 
+def _build_trigger(schedule: str) -> CronTrigger:
+    """Build the crawl trigger from a crontab string, defaulting to daily at 6 AM."""
+    try:
+        return CronTrigger.from_crontab(schedule)
+    except ValueError as e:
+        logger.warning("Invalid cron schedule %r, using daily at 6 AM: %s", schedule, e)
+        return CronTrigger(hour=6, minute=0)
+
+
+# Validated once at import
+_TRIGGER = _build_trigger(settings.cron_schedule)
+
+
 class Scheduler:
-    """Cron scheduler for triggering crawl jobs."""
+    """Cron scheduler for triggering crawl jobs.
+    
+    Runs on the current asyncio event loop; create it from a coroutine
+    (e.g. the API startup hook) so it attaches to the running loop.
+    """
     
     def __init__(self):
         """Initialize scheduler."""
-        self.scheduler = BackgroundScheduler()
-        self.api_url = f"http://{settings.api_host}:{settings.api_port}"
+        self.scheduler = AsyncIOScheduler()
     
-    def trigger_cron_job(self):
-        """Trigger cron job via API."""
+    async def trigger_cron_job(self):
+        """Run the crawl and digest job in-process."""
         try:
-            url = f"{self.api_url}/cron/run"
-            response = requests.post(url, timeout=600)  # 10 minute timeout
-            response.raise_for_status()
-            logger.info(f"Cron job triggered successfully: {response.json()}")
+            from api.main import run_cron_job
+            result = await run_cron_job()
+            logger.info("Cron job triggered successfully: %s", result)
         except Exception as e:
-            logger.error(f"Error triggering cron job: {e}")
+            logger.error("Error triggering cron job: %s", e, exc_info=True)
     
     def start(self):
         """Start scheduler."""
-        # Parse cron schedule
-        cron_parts = settings.cron_schedule.split()
-        if len(cron_parts) == 5:
-            minute, hour, day, month, day_of_week = cron_parts
-            self.scheduler.add_job(
-                self.trigger_cron_job,
-                trigger=CronTrigger(
-                    minute=minute,
-                    hour=hour,
-                    day=day,
-                    month=month,
-                    day_of_week=day_of_week
-                ),
-                id="crawl_job",
-                name="Crawl and Digest Job"
-            )
-        else:
-            # Default: daily at 6 AM
-            self.scheduler.add_job(
-                self.trigger_cron_job,
-                trigger=CronTrigger(hour=6, minute=0),
-                id="crawl_job",
-                name="Crawl and Digest Job"
-            )
+        self.scheduler.add_job(
+            self.trigger_cron_job,
+            trigger=_TRIGGER,
+            id="crawl_job",
+            name="Crawl and Digest Job"
+        )
         
         self.scheduler.start()
-        logger.info(f"Scheduler started with schedule: {settings.cron_schedule}")
+        logger.info("Scheduler started with schedule: %s", settings.cron_schedule)
     
     def stop(self):
         """Stop scheduler."""
@@ -4,20 +4,19 @@ Usage:
     python scripts/create_tables.py
 
 Requires:
-    - DATABASE_URL env var pointing to the target database.
+    - DATABASE_URL (env var or .env) pointing to the target database.
 """
 
-import os
 import sys
 
+from config import settings
 from database.session import engine
 from database import models
 
 
 def main() -> None:
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
-        print("DATABASE_URL is not set. Please export it before running.")
+    if not settings.database_url:
+        print("DATABASE_URL is not set. Please set it in the environment or .env.")
         sys.exit(1)
 
     models.Base.metadata.create_all(bind=engine)
@@ -1,14 +1,24 @@
-from database.session import SessionLocal
+from sqlalchemy import func, select
+
+from database.session import engine
 from database import models
 
-session = SessionLocal()
-try:
-    counts = {
-        "documents": session.query(models.Document).count(),
-        "opportunities": session.query(models.Opportunity).count(),
-        "changes": session.query(models.Change).count(),
-    }
-    for table, count in counts.items():
-        print(f"{table}: {count}")
-finally:
-    session.close()
+# All three counts as scalar subqueries of one SELECT (single round-trip)
+COUNT_MODELS = {
+    "documents": models.Document,
+    "opportunities": models.Opportunity,
+    "changes": models.Change,
+}
+
+# Core connection: no ORM session or identity map needed for counting
+with engine.connect() as conn:
+    row = conn.execute(
+        select(*(
+            select(func.count()).select_from(model).scalar_subquery()
+            for model in COUNT_MODELS.values()
+        ))
+    ).one()
+
+counts = dict(zip(COUNT_MODELS, row))
+for table, count in counts.items():
+    print(f"{table}: {count}")
@@ -1,24 +1,83 @@
 """Pytest configuration."""
 import pytest
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from database.models import Base
 
 # Use test database
-TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite:///./test.db")
+TEST_DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    "sqlite+pysqlite:///file:test_db?mode=memory&cache=shared&uri=true"
+)
 
 
-@pytest.fixture
-def db_session():
-    """Create test database session."""
-    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+def _connect_args(url: str) -> dict:
+    """Driver connect args for the test database."""
+    if url.startswith("sqlite"):
+        return {"check_same_thread": False, "uri": "uri=true" in url}
+    if url.startswith("postgresql"):
+        # Test data is disposable; skip waiting for WAL flushes
+        return {"options": "-c synchronous_commit=off"}
+    return {}
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """Create the test engine and schema once per test run."""
+    engine_kwargs = {}
+    if "mode=memory" in TEST_DATABASE_URL:
+        # One shared connection so every session sees the same in-memory DB
+        engine_kwargs["poolclass"] = StaticPool
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        query_cache_size=1200,
+        connect_args=_connect_args(TEST_DATABASE_URL),
+        **engine_kwargs
+    )
+
+    if engine.dialect.name == "sqlite":
+        # pysqlite's own transaction handling breaks SAVEPOINT; emit BEGIN ourselves
+        @event.listens_for(engine, "connect")
+        def _configure_sqlite(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+            # Trade durability for speed; test data is disposable
+            cursor = dbapi_connection.cursor()
+            if "mode=memory" not in TEST_DATABASE_URL:
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
+
+        @event.listens_for(engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    """Create test database session rolled back after each test."""
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    # Session commits release a SAVEPOINT; the outer transaction is rolled back
+    SessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint"
+    )
     session = SessionLocal()
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
-
+        transaction.rollback()
+        connection.close()
@@ -1,7 +1,14 @@
 """Tests for API endpoints."""
+import asyncio
+import uuid
+from unittest.mock import MagicMock
+
 import pytest
 from fastapi.testclient import TestClient
-from api.main import app
+from api.main import app, process_incoming_message
+from config import settings
+from database.models import Subscriber
+from tools.whatsapp import delivery_tracker
 
 client = TestClient(app)
 
@@ -28,3 +35,59 @@ def test_cron_endpoint():
     # assert response.status_code in [200, 500]
     pass
 
+
+def _tracked_message(message_id: str) -> str:
+    """Register a send_text_nowait message the provider accepted as `message_id`."""
+    correlation_id = uuid.uuid4().hex
+    delivery_tracker.register(correlation_id)
+    delivery_tracker.accept(correlation_id, message_id)
+    return correlation_id
+
+
+def test_twilio_status_callback_updates_delivery_tracker(monkeypatch):
+    """Twilio MessageStatus callbacks advance tracked messages by MessageSid."""
+    monkeypatch.setattr(settings, "whatsapp_provider", "twilio", raising=False)
+    message_sid = f"SM{uuid.uuid4().hex}"
+    correlation_id = _tracked_message(message_sid)
+
+    for status in ("sent", "delivered", "sent"):
+        response = client.post(
+            "/whatsapp/webhook",
+            data={"MessageSid": message_sid, "MessageStatus": status},
+        )
+        assert response.status_code == 200
+
+    assert delivery_tracker.wait(correlation_id, timeout=0) == "delivered"
+
+
+def test_meta_status_webhook_updates_delivery_tracker(monkeypatch):
+    """Meta status webhooks advance tracked messages by WhatsApp message id."""
+    monkeypatch.setattr(settings, "whatsapp_provider", "meta", raising=False)
+    message_id = f"wamid.{uuid.uuid4().hex}"
+    correlation_id = _tracked_message(message_id)
+
+    response = client.post("/whatsapp/webhook", json={
+        "object": "whatsapp_business_account",
+        "entry": [{"changes": [{"value": {"statuses": [
+            {"id": message_id, "status": "read"},
+        ]}}]}],
+    })
+
+    assert response.status_code == 200
+    assert delivery_tracker.status(correlation_id) == "read"
+
+
+def test_subscribe_commits_subscriber(db_session, monkeypatch):
+    """SUBSCRIBE commits a new subscriber through the request session."""
+    monkeypatch.setattr("api.main.whatsapp_sender", MagicMock())
+
+    asyncio.run(process_incoming_message("2348000000001", "SUBSCRIBE", db_session))
+
+    subscriber = db_session.query(Subscriber).one()
+    assert subscriber.handle == "2348000000001"
+    assert subscriber.active
+
+
+def test_committed_rows_are_rolled_back_between_tests(db_session):
+    """Rows committed by the previous test do not leak into this one."""
+    assert db_session.query(Subscriber).count() == 0
@@ -1,4 +1,6 @@
 """Tests for deduplication."""
+import hashlib
+
 import pytest
 from dedupe.dedupe import Deduper
 
@@ -42,3 +44,31 @@ def test_no_duplicate():
     is_dup2, _ = deduper.is_exact_duplicate(content2)
     assert not is_dup2
 
+
+
+def test_duplicate_by_hash():
+    """Test duplicate detection with a precomputed content hash."""
+    deduper = Deduper()
+    content = "This is a test document about Nigerian grants."
+    
+    is_dup, exact_hash, _ = deduper.is_duplicate(content, content_hash="abc123")
+    assert not is_dup
+    assert exact_hash == "abc123"
+    
+    assert deduper.is_duplicate_by_hash("abc123")
+    assert not deduper.is_duplicate_by_hash("def456")
+
+
+def test_precomputed_hash_matches_text_hash():
+    """A precomputed text hash and hashing the text detect the same duplicates."""
+    deduper = Deduper()
+    content = "Federal scholarship applications close on 31 March."
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    is_dup, exact_hash, _ = deduper.is_duplicate(content, content_hash=content_hash)
+    assert not is_dup
+    assert exact_hash == content_hash
+    
+    is_dup, exact_hash, _ = deduper.is_duplicate(content)
+    assert is_dup
+    assert exact_hash == content_hash
@@ -0,0 +1,44 @@
+"""Tests for ICS generation."""
+from datetime import datetime
+
+from tools.ics_generator import generate_ics
+
+
+def test_generate_ics(tmp_path):
+    """Test ICS output fields and text escaping."""
+    output_path = tmp_path / "deadline.ics"
+    generate_ics(
+        title="Grant; Round 2, Final",
+        deadline=datetime(2025, 3, 31, 17, 0),
+        description="Apply online",
+        url="https://example.com/grant",
+        output_path=str(output_path)
+    )
+    
+    content = output_path.read_bytes().decode("utf-8")
+    lines = content.split("\r\n")
+    assert lines[0] == "BEGIN:VCALENDAR"
+    assert "DTSTART:20250331T170000Z" in lines
+    assert "DTEND:20250331T170000Z" in lines
+    assert "SUMMARY:Grant\\; Round 2\\, Final" in lines
+    assert "DESCRIPTION:Apply online\\n\\nURL: https://example.com/grant" in lines
+    assert "URL:https://example.com/grant" in lines
+    assert content.endswith("END:VCALENDAR\r\n")
+
+
+def test_generate_ics_folds_long_lines(tmp_path):
+    """Content lines over 75 octets are folded without splitting characters."""
+    output_path = tmp_path / "long.ics"
+    title = "Federal Government Scholarship for Undergraduates — Bilateral Education Agreement Award " * 2
+    generate_ics(
+        title=title,
+        deadline=datetime(2025, 3, 31, 17, 0),
+        output_path=str(output_path)
+    )
+    
+    content = output_path.read_bytes().decode("utf-8")
+    lines = content.split("\r\n")
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert any(line.startswith(" ") for line in lines)
+    unfolded = content.replace("\r\n ", "").split("\r\n")
+    assert f"SUMMARY:{title}" in unfolded
@@ -0,0 +1,74 @@
+"""Tests for the ingestion pipeline."""
+from unittest.mock import MagicMock
+
+from config import settings
+from database.models import Document, Opportunity, Source
+from ingest.ingester import Ingester
+from tools.schemas import CrawlOut, OppExtract
+
+
+TEXTS = {
+    "federal": "Federal Government scholarship for undergraduate engineering students opens in March.",
+    "broken": "Petroleum Trust Fund postgraduate award accepts applicants holding a second class upper.",
+    "state": "Lagos State bursary for nursing trainees requires an indigene certificate and admission letter.",
+}
+
+
+def _crawl_result(name: str) -> CrawlOut:
+    return CrawlOut(
+        url=f"https://example.com/{name}",
+        title=name.title(),
+        fetched_at="2025-01-01T00:00:00",
+        http_hash=f"hash-{name}",
+        mime="text/html",
+        raw_text=TEXTS[name]
+    )
+
+
+def _extract_opportunities(url, title, text):
+    # The "broken" opportunity violates agency NOT NULL when flushed
+    return [OppExtract.model_construct(
+        title=title,
+        agency=None if "broken" in url else "Ministry of Education",
+        url=url,
+        deadline=None,
+        eligibility=None,
+        amount=None,
+        action="Apply"
+    )]
+
+
+def test_ingest_skips_only_the_failing_document(db_session, monkeypatch):
+    """A row that fails to insert is skipped; the rest of the run is kept."""
+    for name in ("RAGStore", "ChangeDetector", "OpportunityExtractor", "ProposalWriter", "get_whatsapp_sender"):
+        monkeypatch.setattr(f"ingest.ingester.{name}", MagicMock())
+    monkeypatch.setattr("ingest.ingester.get_embed_queue", lambda: None)
+    monkeypatch.setattr(settings, "enable_auto_proposal_sending", False, raising=False)
+    
+    source = Source(name="Test Source", url="https://example.com")
+    db_session.add(source)
+    db_session.flush()
+    
+    ingester = Ingester(db=db_session, max_agent_workers=2)
+    ingester.opportunity_extractor.extract_opportunities.side_effect = _extract_opportunities
+    
+    count = ingester.ingest(source.id, [_crawl_result(name) for name in TEXTS])
+    
+    assert count == 2
+    assert sorted(doc.url for doc in db_session.query(Document).all()) == [
+        "https://example.com/federal",
+        "https://example.com/state",
+    ]
+    assert db_session.query(Opportunity).count() == 2
+    
+    # Only the stored documents were queued for embedding
+    deferred_urls = {
+        chunk["url"]
+        for call in ingester.rag_store.add_documents_deferred.call_args_list
+        for chunk in call.args[0]
+    }
+    assert deferred_urls == {"https://example.com/federal", "https://example.com/state"}
+    
+    # The failed document is not remembered as seen, so a retry can ingest it
+    is_duplicate, _, _ = ingester.deduper.is_duplicate(TEXTS["broken"])
+    assert not is_duplicate
@@ -0,0 +1,58 @@
+"""Tests for signed proposal download links."""
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from config import settings
+from tools import proposal_links
+from tools.proposal_links import (
+    create_signed_proposal_download_url,
+    proposal_download_signature,
+    verify_proposal_download_signature,
+)
+
+
+@pytest.fixture(autouse=True)
+def signing_secret(monkeypatch):
+    """Sign with a fixed secret and rebuild the cached keys around each test."""
+    monkeypatch.setattr(settings, "proposal_link_secret", "test-secret", raising=False)
+    monkeypatch.setattr(settings, "public_base_url", "https://example.com/", raising=False)
+    proposal_links._get_signing_prototype.cache_clear()
+    proposal_links._get_blake3_key.cache_clear()
+    yield
+    proposal_links._get_signing_prototype.cache_clear()
+    proposal_links._get_blake3_key.cache_clear()
+
+
+def _round_trip(proposal_id: int) -> None:
+    url = create_signed_proposal_download_url(proposal_id)
+    parsed = urlparse(url)
+    assert parsed.path == f"/proposals/{proposal_id}"
+    query = parse_qs(parsed.query)
+    exp = int(query["exp"][0])
+    sig = query["sig"][0]
+    assert exp > time.time()
+    assert verify_proposal_download_signature(proposal_id, exp, sig)
+    assert not verify_proposal_download_signature(proposal_id + 1, exp, sig)
+    assert not verify_proposal_download_signature(proposal_id, exp + 1, sig)
+    assert not verify_proposal_download_signature(proposal_id, exp, "")
+
+
+def test_hmac_link_round_trip(monkeypatch):
+    """HMAC-SHA256 links verify and reject tampering."""
+    monkeypatch.setattr(settings, "proposal_link_signature_alg", "hmac-sha256", raising=False)
+    _round_trip(7)
+
+
+def test_blake3_link_round_trip(monkeypatch):
+    """BLAKE3 links verify, and earlier HMAC links stay valid."""
+    pytest.importorskip("blake3")
+    monkeypatch.setattr(settings, "proposal_link_signature_alg", "hmac-sha256", raising=False)
+    exp = int(time.time()) + 60
+    hmac_sig = proposal_download_signature(7, exp)
+
+    monkeypatch.setattr(settings, "proposal_link_signature_alg", "blake3", raising=False)
+    assert proposal_download_signature(7, exp) != hmac_sig
+    assert verify_proposal_download_signature(7, exp, hmac_sig)
+    _round_trip(7)
@@ -4,6 +4,7 @@ from unittest.mock import patch, MagicMock
 from rag.store import RAGStore, EmbeddingClient
 from rag.chunker import chunk_text
 import os
+import uuid
 
 
 def test_chunk_text():
@@ -29,6 +30,28 @@ This section contains information about deadlines.
     assert all(chunk["url"] == url for chunk in chunks)
 
 
+def test_chunk_text_overlap():
+    """Test that consecutive chunks start with the previous chunk's tail."""
+    paragraphs = [f"Paragraph {i} " + "about scholarship eligibility " * 10 for i in range(10)]
+    text = "\n\n".join(paragraphs)
+    
+    chunks = chunk_text(text, "https://example.com/overlap", "Overlap", chunk_size=1000, chunk_overlap=200)
+    
+    assert len(chunks) > 1
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current["text"].startswith(previous["text"][-200:].strip())
+
+
+def test_chunk_text_splits_oversized_sections():
+    """Test that oversized sections are split into overlapping windows."""
+    text = "x" * 2500
+    
+    chunks = chunk_text(text, "https://example.com/long", "Long", chunk_size=1000, chunk_overlap=200)
+    
+    assert all(len(chunk["text"]) <= 1000 for chunk in chunks)
+    assert [len(chunk["text"]) for chunk in chunks] == [1000, 1000, 900]
+
+
 def test_rag_store():
     """Test RAG store operations."""
     rag_store = RAGStore()
@@ -58,6 +81,39 @@ def test_rag_store():
     assert "url" in results[0]
 
 
+def test_rag_store_deferred_flush():
+    """Test that deferred chunks are only embedded on flush."""
+    rag_store = RAGStore()
+    run_id = uuid.uuid4().hex
+    
+    chunks = [
+        {
+            "text": f"Scholarship document number {i} for Nigerian students ({run_id}).",
+            "url": f"https://example.com/deferred/{run_id}/{i}",
+            "title": f"Deferred Document {i}",
+            "heading": None,
+            "metadata": {}
+        }
+        for i in range(3)
+    ]
+    count_before = rag_store.collection.count()
+    
+    rag_store.add_documents_deferred(chunks[:2])
+    rag_store.add_documents_deferred(chunks[2:])
+    assert rag_store.collection.count() == count_before
+    
+    # Pending chunks come back in queue order and are removed from the queue
+    assert rag_store.take_pending() == chunks
+    assert rag_store.take_pending() == []
+    
+    rag_store.add_documents_deferred(chunks)
+    assert rag_store.flush() is True
+    assert rag_store.collection.count() == count_before + 3
+    
+    # Nothing left to flush
+    assert rag_store.flush() is False
+
+
 def test_embedding_client_remote(monkeypatch):
     """Test EmbeddingClient with remote service."""
     # Mock environment variables for remote mode
@@ -99,6 +155,27 @@ def test_embedding_client_remote(monkeypatch):
             pytest.skip(f"Remote mode not properly configured: {e}")
 
 
+def test_embedding_client_query_cache():
+    """Test that repeated queries reuse the cached embedding across clients."""
+    client = EmbeddingClient()
+    other_client = EmbeddingClient()
+    client.clear_query_cache()
+    
+    with patch.object(client, "encode", return_value=[[0.1, 0.2]]) as mock_encode:
+        assert client.encode_query("scholarships") == [0.1, 0.2]
+        assert client.encode_query("scholarships") == [0.1, 0.2]
+        assert mock_encode.call_count == 1
+        
+        # A new client (e.g. a per-request RAGStore) shares the cache
+        with patch.object(other_client, "encode") as other_encode:
+            assert other_client.encode_query("scholarships") == [0.1, 0.2]
+            other_encode.assert_not_called()
+        
+        client.clear_query_cache()
+        client.encode_query("scholarships")
+        assert mock_encode.call_count == 2
+
+
 # TODO: Add integration test for remote embedding service
 # This would require a running embedding service or a more sophisticated mock
 
@@ -1,11 +1,21 @@
 """Tests for WhatsApp sender selection."""
+import asyncio
+import logging
+import threading
+import uuid
 from unittest.mock import MagicMock
 
 from config import settings
 from tools.whatsapp import (
+    close_whatsapp_senders,
     get_whatsapp_sender,
+    BaseWhatsAppSender,
+    DeliveryTracker,
     MetaWhatsAppSender,
+    PreparedRecipient,
     TwilioWhatsAppSender,
+    WhatsAppDispatcher,
+    delivery_tracker,
 )
 
 
@@ -16,6 +26,24 @@ def test_get_whatsapp_sender_meta(monkeypatch):
     assert isinstance(sender, MetaWhatsAppSender)
 
 
+def test_get_whatsapp_sender_keeps_replaced_sender_open(monkeypatch):
+    """A settings change builds a new sender without closing one still in use."""
+    monkeypatch.setattr(settings, "whatsapp_provider", "meta", raising=False)
+    monkeypatch.setattr(settings, "whatsapp_phone_number_id", "111", raising=False)
+    sender = get_whatsapp_sender()
+    assert get_whatsapp_sender() is sender
+
+    monkeypatch.setattr(settings, "whatsapp_phone_number_id", "222", raising=False)
+    replacement = get_whatsapp_sender()
+
+    assert replacement is not sender
+    assert not sender._client.is_closed
+
+    close_whatsapp_senders()
+    assert sender._client.is_closed
+    assert replacement._client.is_closed
+
+
 def test_get_whatsapp_sender_twilio(monkeypatch):
     """Twilio provider should instantiate Twilio sender."""
     mock_client = MagicMock()
@@ -25,6 +53,7 @@ def test_get_whatsapp_sender_twilio(monkeypatch):
     monkeypatch.setattr(settings, "twilio_auth_token", "token", raising=False)
     monkeypatch.setattr(settings, "twilio_whatsapp_number", "whatsapp:+15551234567", raising=False)
     monkeypatch.setattr("tools.whatsapp.TwilioClient", MagicMock(return_value=mock_client))
+    monkeypatch.setattr("tools.whatsapp.TwilioHttpClient", MagicMock())
 
     sender = get_whatsapp_sender()
     assert isinstance(sender, TwilioWhatsAppSender)
@@ -36,3 +65,240 @@ def test_get_whatsapp_sender_twilio(monkeypatch):
         body="hello",
     )
 
+    sender.send_text(PreparedRecipient.from_number("+15559876543"), "hello again")
+    mock_client.messages.create.assert_called_with(
+        from_="whatsapp:+15551234567",
+        to="whatsapp:+15559876543",
+        body="hello again",
+    )
+
+    # Tracked sends return the MessageSid that Twilio status callbacks report
+    mock_client.messages.create.return_value.sid = "SM123"
+    assert sender._send_text_tracked("15559876543", "tracked") == "SM123"
+
+
+
+def test_send_text_many_preserves_order():
+    """Bulk sends should report per-recipient results in input order."""
+    class RecordingSender(BaseWhatsAppSender):
+        def __init__(self):
+            self.sent = []
+
+        def send_text(self, to, message):
+            self.sent.append(to)
+            if to == "bad":
+                raise ValueError("Invalid WhatsApp number")
+            return True
+
+    sender = RecordingSender()
+    recipients = [f"1555000{i:04d}" for i in range(20)] + ["bad"]
+
+    results = sender.send_text_many(recipients, "hello", concurrency=4, rate=1000)
+
+    assert results == [True] * 20 + [False]
+    assert sorted(sender.sent) == sorted(recipients)
+
+
+def test_proposal_messages_wrap_long_lines():
+    """Lines over the message limit are hard-wrapped; blank text sends nothing."""
+    sender = BaseWhatsAppSender()
+    proposal_text = "Intro\n" + "x" * 3200 + "\nClosing"
+
+    messages = sender._proposal_messages(proposal_text)
+
+    bodies = [message.split("\n\n", 1)[1] for message in messages]
+    assert bodies == ["Intro", "x" * 1500, "x" * 1500, "x" * 200, "Closing"]
+    assert messages[0].startswith("📄 *Proposal Part 1/5*")
+    assert sender._proposal_messages(" \n ") == []
+
+
+def test_send_proposal_text_many_async_is_rate_limited(monkeypatch):
+    """Concurrent proposal broadcasts take a rate-limit token for every part."""
+    acquired = []
+
+    class RecordingBucket:
+        def __init__(self, rate, capacity=1.0):
+            self.rate = rate
+
+        async def acquire_async(self):
+            acquired.append(self.rate)
+
+    monkeypatch.setattr(settings, "whatsapp_provider", "meta", raising=False)
+    monkeypatch.setattr("tools.whatsapp._TokenBucket", RecordingBucket)
+    sender = MetaWhatsAppSender()
+    sent = []
+
+    async def fake_send_text_async(to, message):
+        sent.append((to, message))
+        return to != "bad"
+
+    monkeypatch.setattr(sender, "send_text_async", fake_send_text_async)
+    proposal_text = "Intro\n" + "x" * 1600
+
+    results = asyncio.run(sender.send_proposal_text_many_async(
+        ["15550001", "bad", "15550002"], proposal_text, "Grant", concurrency=2, rate=40
+    ))
+
+    assert results == [True, False, True]
+    assert acquired == [40] * 9
+    assert len(sent) == 9
+    sender.close()
+
+
+def test_delivery_tracker_keeps_furthest_status():
+    """Late or unknown webhook statuses never move a message backwards."""
+    tracker = DeliveryTracker()
+    tracker.register("c1")
+    tracker.accept("c1", "wamid.1")
+    assert tracker.status("c1") == "accepted"
+
+    tracker.update_from_webhook("wamid.1", "delivered")
+    tracker.update_from_webhook("wamid.1", "sent")
+    tracker.update_from_webhook("wamid.1", "sending")
+    assert tracker.status("c1") == "delivered"
+    assert tracker.wait("c1", timeout=0) == "delivered"
+
+    tracker.update_from_webhook("wamid.1", "read")
+    assert tracker.status("c1") == "read"
+
+    tracker.update_from_webhook("unknown", "failed")
+    tracker.update("missing", "failed")
+    assert tracker.status("missing") is None
+
+
+def test_delivery_tracker_wait_times_out_before_final_status():
+    """wait returns the latest non-final status when the timeout expires."""
+    tracker = DeliveryTracker()
+    tracker.register("c1")
+    tracker.accept("c1", "SM1")
+    tracker.update_from_webhook("SM1", "sent")
+
+    assert tracker.wait("c1", timeout=0.01) == "sent"
+
+    tracker.update_from_webhook("SM1", "undelivered")
+    assert tracker.wait("c1", timeout=0) == "undelivered"
+
+
+def test_delivery_tracker_applies_status_received_before_accept():
+    """A webhook that beats the send response is applied once the id is mapped."""
+    tracker = DeliveryTracker(max_entries=2)
+    tracker.register("c1")
+    tracker.update_from_webhook("wamid.1", "delivered")
+    tracker.update_from_webhook("wamid.1", "sent")
+    assert tracker.status("c1") == "queued"
+
+    tracker.accept("c1", "wamid.1")
+    assert tracker.status("c1") == "delivered"
+    assert tracker.wait("c1", timeout=0) == "delivered"
+
+    # Buffered statuses are bounded like the other maps
+    for i in range(5):
+        tracker.update_from_webhook(f"wamid.x{i}", "sent")
+    assert len(tracker._early_statuses) == 2
+
+
+class DispatchRecordingSender(BaseWhatsAppSender):
+    """Sender recording what a WhatsAppDispatcher hands it."""
+
+    def __init__(self):
+        self.tracked = []
+        self.batches = []
+
+    def send_text(self, to, message):
+        return to != "bad"
+
+    def _send_text_tracked(self, to, message):
+        self.tracked.append((to, message))
+        if to == "boom":
+            raise ValueError("Invalid WhatsApp number")
+        return None if to == "bad" else f"id-{message}"
+
+    def send_text_many(self, recipients, message, **kwargs):
+        self.batches.append((message, list(recipients)))
+        return [self.send_text(to, message) for to in recipients]
+
+
+def test_dispatcher_sends_tracked_messages_in_order():
+    """A single worker sends tracked messages in the order they were queued."""
+    sender = DispatchRecordingSender()
+    dispatcher = WhatsAppDispatcher(sender, workers=1, batch_max=4, batch_ms=5, rate=10_000)
+    correlation_ids = [uuid.uuid4().hex for _ in range(10)]
+    for i, correlation_id in enumerate(correlation_ids):
+        delivery_tracker.register(correlation_id)
+        assert dispatcher.enqueue("15550001", str(i), correlation_id)
+
+    dispatcher.close()
+
+    assert sender.tracked == [("15550001", str(i)) for i in range(10)]
+    assert all(delivery_tracker.status(c) == "accepted" for c in correlation_ids)
+
+
+def test_dispatcher_batches_untracked_messages_by_text():
+    """Untracked messages queued together go out in one send_text_many per text."""
+    sender = DispatchRecordingSender()
+    dispatcher = WhatsAppDispatcher(sender, workers=1, batch_max=5, batch_ms=1000, rate=10_000)
+    for to in ("1", "2", "3"):
+        dispatcher.enqueue(to, "hello")
+    dispatcher.enqueue("4", "other")
+    dispatcher.enqueue("5", "hello")
+
+    dispatcher.close()
+
+    assert sender.batches == [("hello", ["1", "2", "3", "5"]), ("other", ["4"])]
+
+
+def test_dispatcher_reports_failures(caplog):
+    """Failed tracked sends are marked failed; untracked failures are logged."""
+    sender = DispatchRecordingSender()
+    dispatcher = WhatsAppDispatcher(sender, workers=1, batch_max=8, batch_ms=5, rate=10_000)
+    failed_id, raised_id, ok_id = (uuid.uuid4().hex for _ in range(3))
+    for correlation_id in (failed_id, raised_id, ok_id):
+        delivery_tracker.register(correlation_id)
+
+    with caplog.at_level(logging.WARNING, logger="tools.whatsapp"):
+        dispatcher.enqueue("bad", "a", failed_id)
+        dispatcher.enqueue("boom", "b", raised_id)
+        dispatcher.enqueue("15550001", "c", ok_id)
+        dispatcher.enqueue("bad", "d")
+        dispatcher.close()
+
+    assert delivery_tracker.status(failed_id) == "failed"
+    assert delivery_tracker.status(raised_id) == "failed"
+    assert delivery_tracker.status(ok_id) == "accepted"
+    assert "Failed to deliver 1/1 queued WhatsApp messages" in caplog.text
+
+
+def test_dispatcher_close_drains_queue_and_rejects_new_messages():
+    """close() sends everything already queued, then refuses new messages."""
+    sender = DispatchRecordingSender()
+    sender.enqueue("1", "first")
+    sender.enqueue("2", "second")
+
+    sender.close()
+
+    assert sorted(to for _, recipients in sender.batches for to in recipients) == ["1", "2"]
+    assert not sender.enqueue("3", "late")
+
+
+def test_dispatcher_close_racing_enqueue_loses_no_accepted_message():
+    """A message enqueue() accepts while close() runs is still sent."""
+    sender = DispatchRecordingSender()
+    dispatcher = WhatsAppDispatcher(sender, workers=1, batch_ms=1, rate=10_000)
+    dispatcher.enqueue("1", "first")
+    closer = threading.Thread(target=dispatcher.close)
+    put_nowait = dispatcher._queue.put_nowait
+
+    def racing_put(item):
+        # Let close() run between enqueue()'s closed check and its put
+        if item[0] == "2":
+            closer.start()
+            closer.join(timeout=0.2)
+        put_nowait(item)
+
+    dispatcher._queue.put_nowait = racing_put
+    accepted = dispatcher.enqueue("2", "second")
+    closer.join()
+
+    sent = [to for _, recipients in sender.batches for to in recipients]
+    assert accepted
+    assert sent == ["1", "2"]
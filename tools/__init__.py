@@ -1,13 +1,10 @@
-"""Tools package."""
-from tools.pdf_extractor import extract_text_from_pdf, extract_text_from_pdf_bytes
-from tools.pdf_generator import generate_proposal_pdf
-from tools.whatsapp import (
-    MetaWhatsAppSender,
-    TwilioWhatsAppSender,
-    BaseWhatsAppSender,
-    get_whatsapp_sender,
-)
-from tools.ics_generator import generate_ics
+"""Tools package.
+
+Heavy tool modules (PDF libraries, WeasyPrint, WhatsApp SDKs) are imported
+on first attribute access via PEP 562 ``__getattr__``.
+"""
+import importlib
+
 from tools.schemas import (
     CrawlOut,
     ChangeSummary,
@@ -19,6 +16,21 @@ from tools.schemas import (
     ProposalRequest
 )
 
+# Lazily imported name -> defining submodule
+_LAZY_ATTRS = {
+    "extract_text_from_pdf": "tools.pdf_extractor",
+    "extract_text_from_pdf_bytes": "tools.pdf_extractor",
+    "generate_proposal_pdf": "tools.pdf_generator",
+    "BaseWhatsAppSender": "tools.whatsapp",
+    "MetaWhatsAppSender": "tools.whatsapp",
+    "TwilioWhatsAppSender": "tools.whatsapp",
+    "get_whatsapp_sender": "tools.whatsapp",
+    "close_whatsapp_senders": "tools.whatsapp",
+    "WhatsAppDispatcher": "tools.whatsapp",
+    "PreparedRecipient": "tools.whatsapp",
+    "generate_ics": "tools.ics_generator",
+}
+
 __all__ = [
     "extract_text_from_pdf",
     "extract_text_from_pdf_bytes",
@@ -27,6 +39,9 @@ __all__ = [
     "MetaWhatsAppSender",
     "TwilioWhatsAppSender",
     "get_whatsapp_sender",
+    "close_whatsapp_senders",
+    "WhatsAppDispatcher",
+    "PreparedRecipient",
     "generate_ics",
     "CrawlOut",
     "ChangeSummary",
@@ -38,3 +53,17 @@ __all__ = [
     "ProposalRequest",
 ]
 
+
+def __getattr__(name):
+    """Import lazily exported tools on first access."""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
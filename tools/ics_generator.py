@@ -1,12 +1,67 @@
 """ICS calendar file generator."""
-from ics import Calendar, Event
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from pathlib import Path
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Single-event iCalendar (RFC 5545) document; lines end in CRLF
+ICS_TEMPLATE = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//EduNavigator//EN\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:{uid}\r\n"
+    "DTSTAMP:{dtstamp}\r\n"
+    "DTSTART:{dtstart}\r\n"
+    "DTEND:{dtstart}\r\n"
+    "SUMMARY:{summary}\r\n"
+    "DESCRIPTION:{description}\r\n"
+    "{url_line}"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+def _escape_text(value: str) -> str:
+    """Escape an iCalendar TEXT value."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str, limit: int = 75) -> str:
+    """Fold a content line into lines of at most `limit` octets (RFC 5545 §3.1)."""
+    if len(line.encode("utf-8")) <= limit:
+        return line
+    parts = []
+    current = []
+    size = 0
+    # Continuation lines start with a space, which counts toward the limit
+    width = limit
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > width:
+            parts.append("".join(current))
+            current, size, width = [], 0, limit - 1
+        current.append(char)
+        size += char_size
+    parts.append("".join(current))
+    return "\r\n ".join(parts)
+
+
+def _format_utc(value: datetime) -> str:
+    """Format a datetime as UTC iCalendar DATE-TIME (naive values are taken as UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
 
 def generate_ics(
     title: str,
@@ -29,15 +84,18 @@ def generate_ics(
         Path to generated ICS file
     """
     try:
-        cal = Calendar()
-        event = Event()
-        event.name = title
-        event.begin = deadline
-        event.end = deadline  # Same as begin for deadline events
-        event.description = description + (f"\n\nURL: {url}" if url else "")
-        event.url = url
-        
-        cal.events.add(event)
+        document = ICS_TEMPLATE.format(
+            uid=f"{uuid.uuid4()}@edunavigator",
+            dtstamp=_format_utc(datetime.now(timezone.utc)),
+            # Same start and end for deadline events
+            dtstart=_format_utc(deadline),
+            summary=_escape_text(title),
+            description=_escape_text(description + (f"\n\nURL: {url}" if url else "")),
+            url_line=f"URL:{url}\r\n" if url else ""
+        )
+        ics_content = "".join(
+            _fold(line) + "\r\n" for line in document.split("\r\n")[:-1]
+        )
         
         if output_path is None:
             output_path = f"./storage/ics/{title.replace(' ', '_')}_{deadline.strftime('%Y%m%d')}.ics"
@@ -45,12 +103,12 @@ def generate_ics(
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.writelines(cal)
+        # newline="" keeps the CRLF line endings as written
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            f.write(ics_content)
         
         logger.info(f"Generated ICS file: {output_path}")
         return str(output_path)
     except Exception as e:
         logger.error(f"Error generating ICS file: {e}")
         raise
-
@@ -2,10 +2,20 @@ import base64
 import hashlib
 import hmac
 import time
+from functools import lru_cache
 from typing import Optional
 
 from config import settings
 
+# SIMD keyed hashing for PROPOSAL_LINK_SIGNATURE_ALG=blake3
+try:
+    import blake3
+    _blake3_available = True
+except ImportError:
+    _blake3_available = False
+
+BLAKE3_KEY_CONTEXT = "EduNavigator 2024 proposal download links"
+
 
 def _urlsafe_b64encode_no_padding(raw: bytes) -> str:
     return base64.urlsafe_b64encode(raw).decode("utf-8").rstrip("=")
@@ -18,20 +28,59 @@ def _get_signing_secret() -> bytes:
     return secret.encode("utf-8")
 
 
+@lru_cache(maxsize=1)
+def _get_signing_prototype() -> "hmac.HMAC":
+    """HMAC keyed with the signing secret; copy it instead of re-keying per call."""
+    return hmac.new(_get_signing_secret(), digestmod=hashlib.sha256)
+
+
+@lru_cache(maxsize=1)
+def _get_blake3_key() -> bytes:
+    """32-byte BLAKE3 key derived from the signing secret."""
+    return blake3.blake3(
+        _get_signing_secret(), derive_key_context=BLAKE3_KEY_CONTEXT
+    ).digest()
+
+
+def _hmac_sha256_signature(msg: bytes) -> str:
+    mac = _get_signing_prototype().copy()
+    mac.update(msg)
+    return _urlsafe_b64encode_no_padding(mac.digest())
+
+
+def _blake3_signature(msg: bytes) -> str:
+    digest = blake3.blake3(msg, key=_get_blake3_key()).digest()
+    return _urlsafe_b64encode_no_padding(digest)
+
+
+def _use_blake3() -> bool:
+    return settings.proposal_link_signature_alg == "blake3" and _blake3_available
+
+
 def proposal_download_signature(proposal_id: int, exp: int) -> str:
     """
-    Compute an HMAC signature for a proposal download link.
+    Compute a keyed signature for a proposal download link.
 
-    Token format is: sig = HMAC_SHA256(secret, f"{proposal_id}.{exp}").
+    Token format is: sig = HMAC_SHA256(secret, f"{proposal_id}.{exp}"), or
+    keyed BLAKE3 (key derived from the secret) when
+    PROPOSAL_LINK_SIGNATURE_ALG=blake3 and the blake3 package is installed.
     """
     msg = f"{proposal_id}.{exp}".encode("utf-8")
-    digest = hmac.new(_get_signing_secret(), msg, hashlib.sha256).digest()
-    return _urlsafe_b64encode_no_padding(digest)
+    if _use_blake3():
+        return _blake3_signature(msg)
+    return _hmac_sha256_signature(msg)
 
 
 def verify_proposal_download_signature(proposal_id: int, exp: int, sig: str) -> bool:
+    sig = (sig or "").strip()
     expected = proposal_download_signature(proposal_id, exp)
-    return hmac.compare_digest((sig or "").strip(), expected)
+    if hmac.compare_digest(sig, expected):
+        return True
+    if _use_blake3():
+        # Links minted before switching to BLAKE3 stay valid until they expire
+        msg = f"{proposal_id}.{exp}".encode("utf-8")
+        return hmac.compare_digest(sig, _hmac_sha256_signature(msg))
+    return False
 
 
 def create_signed_proposal_download_url(proposal_id: int) -> Optional[str]:
@@ -46,5 +95,5 @@ def create_signed_proposal_download_url(proposal_id: int) -> Optional[str]:
 
     exp = int(time.time()) + int(settings.proposal_link_ttl_seconds)
     sig = proposal_download_signature(proposal_id, exp)
-    return f"{base}/proposals/{proposal_id}/download?exp={exp}&sig={sig}"
+    return f"{base}/proposals/{proposal_id}?exp={exp}&sig={sig}"
 
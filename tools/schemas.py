@@ -12,6 +12,8 @@ class CrawlOut(BaseModel):
     http_hash: str
     mime: str
     raw_text: Optional[str] = None
+    # SHA-256 of raw_text, when the crawler already computed it
+    text_hash: Optional[str] = None
 
 
 class ChangeSummary(BaseModel):
@@ -1,61 +1,301 @@
 """WhatsApp messaging abstraction for Meta and Twilio providers."""
+import asyncio
+import itertools
 import logging
-from typing import Optional, List
+import mimetypes
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Any, Coroutine, Dict, Optional, List, Tuple, Union
 
-import requests
+import httpx
+from requests.adapters import HTTPAdapter
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Retry only failures where the message was not accepted, so sends are
+# never duplicated: connect errors (nothing sent) and 429/503 responses.
+# Read errors may follow a delivered request and are not retried.
+GRAPH_API_CONNECT_RETRIES = 3
+GRAPH_API_RETRY_STATUSES = frozenset({429, 503})
+GRAPH_API_STATUS_RETRIES = 3
+GRAPH_API_BACKOFF = 0.5
+
+# Fail fast when graph.facebook.com is unreachable; allow slow responses
+GRAPH_API_TIMEOUT = httpx.Timeout(30.0, connect=3.05)
+GRAPH_API_UPLOAD_TIMEOUT = httpx.Timeout(60.0, connect=3.05)
+
+try:
+    import orjson
+
+    def _dumps_json(payload: dict) -> bytes:
+        return orjson.dumps(payload)
+except ImportError:  # pragma: no cover - stdlib fallback
+    import json
+
+    def _dumps_json(payload: dict) -> bytes:
+        return json.dumps(payload).encode("utf-8")
+
+# Per-request headers for pre-serialized JSON bodies (not set on the client,
+# where they would override the multipart Content-Type of media uploads)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 try:
     from twilio.rest import Client as TwilioClient
     from twilio.base.exceptions import TwilioException
+    from twilio.http.http_client import TwilioHttpClient
 except ImportError:  # pragma: no cover - twilio optional for meta deployments
     TwilioClient = None  # type: ignore
     TwilioException = Exception  # type: ignore
+    TwilioHttpClient = None  # type: ignore
+
+
+def _run_coroutine_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine to completion from sync code, even inside a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Called from a coroutine (e.g. the cron job); use a private loop in a thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+DIGEST_FOOTER = "\nReply 1/2/3 for full one-pager + calendar invite."
+PROPOSAL_PART_HEADER = "📄 *Proposal Part {}/{}*\n\n"
+
+# Digest entry templates, filled positionally as (i, title, deadline, action, url)
+DIGEST_ITEM_TEMPLATE = "{0}) {1} — Deadline: {2}\n   Action: {3}\n   {4}\n"
+DIGEST_ITEM_NO_DEADLINE_TEMPLATE = "{0}) {1}\n   Action: {3}\n   {4}\n"
+
+
+@lru_cache(maxsize=256)
+def _render_digest(entries: Tuple[Tuple[str, str, str, str], ...]) -> str:
+    """Render (title, deadline, action, url) entries as a digest message."""
+    with_deadline = DIGEST_ITEM_TEMPLATE.format
+    without_deadline = DIGEST_ITEM_NO_DEADLINE_TEMPLATE.format
+    return "\n".join(itertools.chain(
+        (
+            (with_deadline if entry[1] else without_deadline)(i, *entry)
+            for i, entry in enumerate(entries, 1)
+        ),
+        (DIGEST_FOOTER,),
+    ))
+
+
+def render_digest(items: List[dict]) -> str:
+    """
+    Render the digest message for the top three items.
+    
+    Identical digests (e.g. one newsletter sent to a cohort) are rendered once.
+    """
+    entries = tuple(
+        (
+            str(item.get("title", "Untitled")),
+            str(item["deadline"]) if item.get("deadline") else "",
+            str(item.get("action", "See details")),
+            str(item.get("url", "")),
+        )
+        for item in items[:3]
+    )
+    return _render_digest(entries)
+
+
+# "whatsapp://", "whatsapp:" or "whatsapp" prefixes and stray colons
+WHATSAPP_PREFIX_RE = re.compile(r"whatsapp(?::(?://)?)?|:")
+
+# Bulk send defaults, within the Cloud API's documented 80 msg/s baseline
+DEFAULT_SEND_CONCURRENCY = 50
+DEFAULT_SEND_RATE = 80.0
+
+
+class _TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions per second."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative: later callers queue behind earlier ones
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+@dataclass(frozen=True)
+class PreparedRecipient:
+    """
+    Recipient number normalized once to ``whatsapp:+<number>``.
+    
+    Build these up front for broadcasts so senders skip re-normalizing
+    the same number on every send.
+    """
+    __slots__ = ("wa",)
+    wa: str
+
+    @classmethod
+    def from_number(cls, number: str) -> "PreparedRecipient":
+        """Normalize a raw number (raises ValueError if it is empty)."""
+        return cls(TwilioWhatsAppSender._format_number(number))
+
+    @property
+    def number(self) -> str:
+        """The bare number, as the Meta Cloud API expects it."""
+        return self.wa[len("whatsapp:+"):]
+
+
+# A raw number string or a PreparedRecipient
+Recipient = Union[str, PreparedRecipient]
 
 
 class BaseWhatsAppSender:
     """Base WhatsApp sender."""
 
-    def send_text(self, to: str, message: str) -> bool:  # pragma: no cover - abstract
+    def send_text(self, to: Recipient, message: str) -> bool:  # pragma: no cover - abstract
         raise NotImplementedError
 
     def send_document(self, to: str, document_path: str, caption: Optional[str] = None) -> bool:
         logger.warning("Document sending not implemented for this provider")
         return False
 
+    def close(self) -> None:
+        """Deliver queued messages, then release any network resources held by the sender."""
+        dispatcher = getattr(self, "_dispatcher", None)
+        if dispatcher is not None:
+            dispatcher.close()
+
+    def enqueue(self, to: str, message: str, correlation_id: Optional[str] = None) -> bool:
+        """
+        Queue a text message for background delivery (fire-and-forget).
+        
+        Use send_text instead when the caller needs the delivery result.
+        
+        Returns:
+            False if the queue is full and the message was dropped
+        """
+        dispatcher = getattr(self, "_dispatcher", None)
+        if dispatcher is None:
+            with _dispatcher_lock:
+                dispatcher = getattr(self, "_dispatcher", None)
+                if dispatcher is None:
+                    dispatcher = self._dispatcher = WhatsAppDispatcher(self)
+        return dispatcher.enqueue(to, message, correlation_id)
+
+    def send_text_nowait(self, to: str, message: str, correlation_id: Optional[str] = None) -> str:
+        """
+        Queue a message and return a correlation id for tracking its delivery.
+        
+        Progress is recorded in `delivery_tracker`; provider status webhooks
+        advance it to "delivered"/"read"/"failed". Callers that need the
+        outcome can `delivery_tracker.wait(correlation_id, timeout)`.
+        
+        Args:
+            to: Recipient WhatsApp number
+            message: Message text
+            correlation_id: Optional caller-chosen id (generated if omitted)
+        
+        Returns:
+            The correlation id
+        """
+        correlation_id = correlation_id or uuid.uuid4().hex
+        delivery_tracker.register(correlation_id)
+        if not self.enqueue(to, message, correlation_id):
+            delivery_tracker.update(correlation_id, "failed")
+        return correlation_id
+
+    def _send_text_tracked(self, to: Recipient, message: str) -> Optional[str]:
+        """Send a text; return the provider message id ("" if unknown), or None on failure."""
+        return "" if self.send_text(to, message) else None
+
+    def send_text_many(
+        self,
+        recipients: List[Recipient],
+        message: str,
+        *,
+        concurrency: int = DEFAULT_SEND_CONCURRENCY,
+        rate: float = DEFAULT_SEND_RATE,
+    ) -> List[bool]:
+        """
+        Send the same text to many recipients.
+        
+        Sends run on a thread pool and are paced by a token bucket so the
+        provider's rate limit is not exceeded.
+        
+        Args:
+            recipients: Recipient WhatsApp numbers
+            message: Message text
+            concurrency: Maximum sends in flight
+            rate: Maximum sends started per second
+        
+        Returns:
+            Success status per recipient, in order
+        """
+        if not recipients:
+            return []
+
+        bucket = _TokenBucket(rate)
+
+        def _send(to: str) -> bool:
+            bucket.acquire()
+            try:
+                return self.send_text(to, message)
+            except Exception as exc:
+                logger.error("Error sending WhatsApp message to %s: %s", to, exc)
+                return False
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(recipients))) as executor:
+            return list(executor.map(_send, recipients))
+
     def send_digest(self, to: str, items: List[dict]) -> bool:
         if not items:
             logger.warning("Attempted to send digest with no items to %s", to)
             return False
 
-        message_lines = []
-        for i, item in enumerate(items[:3], 1):
-            line = f"{i}) {item.get('title', 'Untitled')}"
-            if item.get("deadline"):
-                line += f" — Deadline: {item['deadline']}"
-            line += f"\n   Action: {item.get('action', 'See details')}"
-            line += f"\n   {item.get('url', '')}\n"
-            message_lines.append(line)
-
-        message_lines.append("\nReply 1/2/3 for full one-pager + calendar invite.")
-        message = "\n".join(message_lines)
+        message = render_digest(items)
         logger.info("Digest message content (%d chars): %s", len(message), message[:200])
         return self.send_text(to, message)
 
-    def send_proposal_text(self, to: str, proposal_text: str, opportunity_title: str) -> bool:
+    def send_digest_many(self, recipients: List[Recipient], items: List[dict]) -> List[bool]:
+        """Render a digest once and send it to every recipient."""
+        if not items:
+            logger.warning("Attempted to send digest with no items to %d recipients", len(recipients))
+            return [False] * len(recipients)
+
+        return self.send_text_many(recipients, render_digest(items))
+
+    def _proposal_messages(self, proposal_text: str) -> List[str]:
         """
-        Send proposal as text message.
-        
-        Args:
-            to: Recipient WhatsApp number
-            proposal_text: Proposal text content
-            opportunity_title: Opportunity title for logging
+        Split proposal text into messages within the provider length limit.
         
-        Returns:
-            Success status
+        Multi-part proposals get a "Part i/n" header on each message. Lines
+        longer than the limit are hard-wrapped. Blank text yields no messages.
         """
         # WhatsApp message length limits:
         # - Meta: 4096 characters
@@ -63,44 +303,362 @@ class BaseWhatsAppSender:
         # Use Twilio's limit to be safe for both providers
         max_length = 1500  # Leave buffer for Twilio's 1600 char limit
         
+        if not proposal_text.strip():
+            return []
+        
         if len(proposal_text) <= max_length:
-            return self.send_text(to, proposal_text)
+            return [proposal_text]
         
-        # Split into chunks
+        # Split into chunks of whole lines, slicing the text once per chunk.
+        # A chunk spans proposal_text[start:pos], newlines included.
         chunks = []
-        lines = proposal_text.split('\n')
-        current_chunk = []
-        current_length = 0
+        text_length = len(proposal_text)
+        start = 0
+        pos = 0
+        
+        while True:
+            newline = proposal_text.find('\n', pos)
+            if newline == -1:
+                newline = text_length
+            line_length = newline - pos + 1  # +1 for newline
+            if pos - start + line_length > max_length and pos > start:
+                chunks.append(proposal_text[start:pos - 1])
+                start = pos
+            if line_length > max_length:
+                # A single line over the limit: hard-wrap it into its own chunks
+                chunks.extend(
+                    proposal_text[i:min(i + max_length, newline)]
+                    for i in range(pos, newline, max_length)
+                )
+                start = newline + 1
+            if newline == text_length:
+                break
+            pos = newline + 1
+        
+        if start <= text_length:
+            chunks.append(proposal_text[start:])
         
-        for line in lines:
-            line_length = len(line) + 1  # +1 for newline
-            if current_length + line_length > max_length and current_chunk:
-                chunks.append('\n'.join(current_chunk))
-                current_chunk = [line]
-                current_length = line_length
-            else:
-                current_chunk.append(line)
-                current_length += line_length
+        # Blank runs around wrapped lines would be sent as empty messages
+        chunks = [chunk for chunk in chunks if chunk.strip()]
         
-        if current_chunk:
-            chunks.append('\n'.join(current_chunk))
+        part_count = len(chunks)
+        if part_count > 1:
+            chunks = [
+                PROPOSAL_PART_HEADER.format(i, part_count) + chunk
+                for i, chunk in enumerate(chunks, 1)
+            ]
+        return chunks
+
+    def send_proposal_text(self, to: str, proposal_text: str, opportunity_title: str) -> bool:
+        """
+        Send proposal as text message.
+        
+        Args:
+            to: Recipient WhatsApp number
+            proposal_text: Proposal text content
+            opportunity_title: Opportunity title for logging
+        
+        Returns:
+            Success status
+        """
+        messages = self._proposal_messages(proposal_text)
+        if not messages:
+            logger.warning("Not sending empty proposal text for '%s' to %s", opportunity_title, to)
+            return False
+        if len(messages) == 1:
+            return self.send_text(to, messages[0])
         
         # Send all chunks
         success = True
-        for i, chunk in enumerate(chunks, 1):
-            if len(chunks) > 1:
-                header = f"📄 *Proposal Part {i}/{len(chunks)}*\n\n"
-                chunk = header + chunk
-            
+        for i, chunk in enumerate(messages, 1):
             if not self.send_text(to, chunk):
                 success = False
-                logger.warning(f"Failed to send proposal chunk {i}/{len(chunks)} to {to}")
+                logger.warning("Failed to send proposal chunk %d/%d to %s", i, len(messages), to)
         
         if success:
-            logger.info(f"Sent proposal text for '{opportunity_title}' to {to} ({len(chunks)} parts)")
+            logger.info("Sent proposal text for '%s' to %s (%d parts)", opportunity_title, to, len(messages))
         
         return success
 
+    def send_proposal_text_many(
+        self, recipients: List[str], proposal_text: str, opportunity_title: str
+    ) -> List[bool]:
+        """
+        Send the same proposal to several recipients.
+        
+        Args:
+            recipients: Recipient WhatsApp numbers
+            proposal_text: Proposal text content
+            opportunity_title: Opportunity title for logging
+        
+        Returns:
+            Success status per recipient, in order
+        """
+        results = []
+        for to in recipients:
+            try:
+                results.append(self.send_proposal_text(to, proposal_text, opportunity_title))
+            except Exception as exc:
+                logger.error("Error sending proposal to %s: %s", to, exc, exc_info=True)
+                results.append(False)
+        return results
+
+
+class DeliveryTracker:
+    """
+    In-memory delivery status for messages sent with send_text_nowait.
+    
+    Statuses move queued -> accepted (provider took the message) and then,
+    from Meta or Twilio status webhooks, to sent/delivered/read/failed.
+    Webhooks can arrive out of order, so a status only replaces one it is
+    further along than. A callback can also beat the send response that
+    maps its message id; such statuses are held until accept() maps the id.
+    Only the most recent `max_entries` correlation ids are kept.
+    """
+
+    FINAL_STATUSES = frozenset({"delivered", "read", "failed", "undelivered"})
+    # Progress order; statuses not listed here (e.g. Twilio "sending") are ignored
+    STATUS_RANK = {
+        "queued": 0,
+        "accepted": 1,
+        "sent": 2,
+        "delivered": 3,
+        "read": 4,
+        "undelivered": 5,
+        "failed": 5,
+    }
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._statuses: "OrderedDict[str, str]" = OrderedDict()
+        self._events: Dict[str, threading.Event] = {}
+        self._by_message_id: "OrderedDict[str, str]" = OrderedDict()
+        # Webhook statuses for message ids accept() has not mapped yet
+        self._early_statuses: "OrderedDict[str, str]" = OrderedDict()
+
+    def register(self, correlation_id: str) -> None:
+        with self._lock:
+            self._statuses[correlation_id] = "queued"
+            self._events[correlation_id] = threading.Event()
+            while len(self._statuses) > self.max_entries:
+                evicted, _ = self._statuses.popitem(last=False)
+                self._events.pop(evicted, None)
+            while len(self._by_message_id) > self.max_entries:
+                self._by_message_id.popitem(last=False)
+
+    def accept(self, correlation_id: str, message_id: str) -> None:
+        """Record that the provider accepted the message under `message_id`."""
+        with self._lock:
+            early_status = None
+            if message_id:
+                self._by_message_id[message_id] = correlation_id
+                early_status = self._early_statuses.pop(message_id, None)
+            if self._statuses.get(correlation_id) == "queued":
+                self._statuses[correlation_id] = "accepted"
+        if early_status is not None:
+            self.update(correlation_id, early_status)
+
+    def update(self, correlation_id: str, status: str) -> None:
+        rank = self.STATUS_RANK.get(status)
+        if rank is None:
+            return
+        with self._lock:
+            current = self._statuses.get(correlation_id)
+            if current is None or self.STATUS_RANK[current] >= rank:
+                return
+            self._statuses[correlation_id] = status
+            event = self._events.get(correlation_id)
+        if event is not None and status in self.FINAL_STATUSES:
+            event.set()
+
+    def update_from_webhook(self, message_id: str, status: str) -> None:
+        """Apply a provider status callback for a provider message id."""
+        rank = self.STATUS_RANK.get(status)
+        if rank is None or not message_id:
+            return
+        with self._lock:
+            correlation_id = self._by_message_id.get(message_id)
+            if correlation_id is None:
+                # The send response has not arrived yet; keep the furthest status
+                buffered = self._early_statuses.get(message_id)
+                if buffered is None or self.STATUS_RANK[buffered] < rank:
+                    self._early_statuses[message_id] = status
+                while len(self._early_statuses) > self.max_entries:
+                    self._early_statuses.popitem(last=False)
+                return
+        self.update(correlation_id, status)
+
+    def status(self, correlation_id: str) -> Optional[str]:
+        with self._lock:
+            return self._statuses.get(correlation_id)
+
+    def wait(self, correlation_id: str, timeout: float) -> Optional[str]:
+        """Block until a final status or `timeout` seconds; return the latest status."""
+        with self._lock:
+            event = self._events.get(correlation_id)
+        if event is not None:
+            event.wait(timeout)
+        return self.status(correlation_id)
+
+    async def wait_async(self, correlation_id: str, timeout: float) -> Optional[str]:
+        """Async wait; the event is set from worker threads, so wait off-loop."""
+        return await asyncio.to_thread(self.wait, correlation_id, timeout)
+
+
+delivery_tracker = DeliveryTracker()
+
+_dispatcher_lock = threading.Lock()
+
+
+class WhatsAppDispatcher:
+    """
+    Background sender for fire-and-forget WhatsApp messages.
+    
+    Messages go onto a bounded queue. Worker threads drain it in batches
+    (up to `batch_max` items or `batch_ms` milliseconds) and send each batch
+    with send_text_many, sharing the send rate between workers. Messages
+    queued with a correlation id are sent individually and reported to
+    `delivery_tracker`. close() sends whatever is still queued before the
+    workers exit.
+    """
+
+    def __init__(
+        self,
+        sender: BaseWhatsAppSender,
+        workers: int = 2,
+        batch_max: int = 32,
+        batch_ms: int = 50,
+        maxsize: int = 10_000,
+        rate: float = DEFAULT_SEND_RATE,
+    ):
+        self.sender = sender
+        self.workers = workers
+        self.batch_max = batch_max
+        self.batch_ms = batch_ms
+        self.rate = rate
+        # None is a worker stop marker queued by close()
+        self._queue: "queue.Queue[Optional[Tuple[str, str, Optional[str]]]]" = queue.Queue(maxsize=maxsize)
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def _start(self) -> None:
+        """Start the workers; called with `_start_lock` held."""
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"whatsapp-dispatch-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def enqueue(self, to: str, message: str, correlation_id: Optional[str] = None) -> bool:
+        """Queue a message; returns False (and drops it) if the queue is full or closed."""
+        # Held across the put so close() cannot queue its stop markers in between
+        with self._start_lock:
+            if self._closed:
+                logger.warning("WhatsApp dispatcher is closed, dropping message to %s", to)
+                return False
+            if not self._threads:
+                self._start()
+            try:
+                self._queue.put_nowait((to, message, correlation_id))
+                return True
+            except queue.Full:
+                logger.warning("WhatsApp dispatch queue full, dropping message to %s", to)
+                return False
+
+    def join(self) -> None:
+        """Block until every queued message has been processed."""
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """
+        Stop accepting messages, send the ones already queued and stop the workers.
+        
+        Args:
+            timeout: Seconds to wait for the queue to drain (None waits indefinitely)
+        """
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        # Each worker exits at its stop marker, queued behind every pending message
+        for _ in threads:
+            self._queue.put(None)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in threads:
+            thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        if any(thread.is_alive() for thread in threads):
+            logger.warning(
+                "WhatsApp dispatcher did not drain within %ss; %d messages left unsent",
+                timeout, self._queue.qsize()
+            )
+
+    def _next_batch(self) -> Tuple[List[Tuple[str, str, Optional[str]]], bool]:
+        """Collect the next batch; the flag is True once this worker's stop marker is reached."""
+        batch: List[Tuple[str, str, Optional[str]]] = []
+        item = self._queue.get()
+        deadline = time.monotonic() + self.batch_ms / 1000
+        while True:
+            if item is None:
+                self._queue.task_done()
+                return batch, True
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.batch_max or remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+        return batch, False
+
+    def _run(self) -> None:
+        worker_rate = self.rate / self.workers
+        bucket = _TokenBucket(worker_rate)
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if not batch:
+                continue
+            try:
+                recipients_by_message: Dict[str, List[str]] = {}
+                for to, message, correlation_id in batch:
+                    if correlation_id is None:
+                        recipients_by_message.setdefault(message, []).append(to)
+                        continue
+                    # Tracked sends go one by one to capture the provider message id
+                    bucket.acquire()
+                    try:
+                        message_id = self.sender._send_text_tracked(to, message)
+                    except Exception as exc:
+                        logger.error("Error sending queued WhatsApp message to %s: %s", to, exc)
+                        message_id = None
+                    if message_id is None:
+                        delivery_tracker.update(correlation_id, "failed")
+                    else:
+                        delivery_tracker.accept(correlation_id, message_id)
+                for message, recipients in recipients_by_message.items():
+                    results = self.sender.send_text_many(recipients, message, rate=worker_rate)
+                    failed = results.count(False)
+                    if failed:
+                        logger.warning("Failed to deliver %d/%d queued WhatsApp messages", failed, len(results))
+            except Exception as exc:
+                logger.error("Error dispatching queued WhatsApp messages: %s", exc, exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a throttled request."""
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    return GRAPH_API_BACKOFF * (2 ** attempt)
+
 
 class MetaWhatsAppSender(BaseWhatsAppSender):
     """WhatsApp message sender using Meta Cloud API."""
@@ -111,22 +669,89 @@ class MetaWhatsAppSender(BaseWhatsAppSender):
         self.api_version = settings.whatsapp_api_version
         self.base_url = f"https://graph.facebook.com/{self.api_version}/{self.phone_number_id}/messages"
 
-    def send_text(self, to: str, message: str) -> bool:
+        # HTTP/2 client: concurrent sends multiplex over one keep-alive TLS
+        # connection to graph.facebook.com
+        self._client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+                retries=GRAPH_API_CONNECT_RETRIES,
+            ),
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            timeout=GRAPH_API_TIMEOUT,
+        )
+
+        # Fixed message fields; each send adds only the recipient and body
+        self._text_payload_template = {
+            "messaging_product": "whatsapp",
+            "recipient_type": "individual",
+            "type": "text",
+        }
+        self._document_payload_template = {
+            "messaging_product": "whatsapp",
+            "recipient_type": "individual",
+            "type": "document",
+        }
+        self._upload_url = f"https://graph.facebook.com/{self.api_version}/{self.phone_number_id}/media"
+
+        # Async client for concurrent sends, bound to the loop that created it
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def close(self) -> None:
+        super().close()
+        self._client.close()
+
+    def _post_json(self, url: str, payload: dict) -> httpx.Response:
+        """POST a JSON payload, retrying throttled (429/503) responses."""
+        body = _dumps_json(payload)
+        for attempt in range(GRAPH_API_STATUS_RETRIES + 1):
+            response = self._client.post(url, content=body, headers=JSON_HEADERS)
+            if response.status_code not in GRAPH_API_RETRY_STATUSES or attempt == GRAPH_API_STATUS_RETRIES:
+                return response
+            time.sleep(_retry_delay(response, attempt))
+        return response
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client.is_closed or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+                    retries=GRAPH_API_CONNECT_RETRIES,
+                ),
+                headers={"Authorization": f"Bearer {self.access_token}"},
+                timeout=GRAPH_API_TIMEOUT,
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    async def close_async(self) -> None:
+        """Close the async client used by the async send methods."""
+        if self._async_client is not None and not self._async_client.is_closed:
+            await self._async_client.aclose()
+        self._async_client = None
+        self._async_loop = None
+
+    async def _post_json_async(self, url: str, payload: dict) -> httpx.Response:
+        """Async _post_json."""
+        client = self._get_async_client()
+        body = _dumps_json(payload)
+        for attempt in range(GRAPH_API_STATUS_RETRIES + 1):
+            response = await client.post(url, content=body, headers=JSON_HEADERS)
+            if response.status_code not in GRAPH_API_RETRY_STATUSES or attempt == GRAPH_API_STATUS_RETRIES:
+                return response
+            await asyncio.sleep(_retry_delay(response, attempt))
+        return response
+
+    async def send_text_async(self, to: Recipient, message: str) -> bool:
         try:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-            }
-
-            payload = {
-                "messaging_product": "whatsapp",
-                "recipient_type": "individual",
-                "to": to,
-                "type": "text",
-                "text": {"body": message},
-            }
-
-            response = requests.post(self.base_url, json=payload, headers=headers, timeout=30)
+            if isinstance(to, PreparedRecipient):
+                to = to.number
+            payload = {**self._text_payload_template, "to": to, "text": {"body": message}}
+
+            response = await self._post_json_async(self.base_url, payload)
             response.raise_for_status()
 
             logger.info("Sent Meta WhatsApp message to %s", to)
@@ -135,34 +760,135 @@ class MetaWhatsAppSender(BaseWhatsAppSender):
             logger.error("Error sending Meta WhatsApp message: %s", exc)
             return False
 
-    def send_document(self, to: str, document_path: str, caption: Optional[str] = None) -> bool:
+    async def send_text_many_async(
+        self,
+        recipients: List[Recipient],
+        message: str,
+        *,
+        concurrency: int = DEFAULT_SEND_CONCURRENCY,
+        rate: float = DEFAULT_SEND_RATE,
+    ) -> List[bool]:
+        """Async send_text_many over the shared HTTP/2 client."""
+        bucket = _TokenBucket(rate)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _send(to: str) -> bool:
+            async with semaphore:
+                await bucket.acquire_async()
+                return await self.send_text_async(to, message)
+
+        return list(await asyncio.gather(*(_send(to) for to in recipients)))
+
+    async def send_proposal_text_async(self, to: str, proposal_text: str, opportunity_title: str) -> bool:
+        """Async send_proposal_text; parts to one recipient are sent in order."""
+        return await self._send_proposal_parts_async(
+            to, self._proposal_messages(proposal_text), opportunity_title
+        )
+
+    async def _send_proposal_parts_async(
+        self,
+        to: str,
+        messages: List[str],
+        opportunity_title: str,
+        bucket: Optional[_TokenBucket] = None,
+    ) -> bool:
+        """Send prepared proposal parts in order, taking a token per part."""
+        if not messages:
+            logger.warning("Not sending empty proposal text for '%s' to %s", opportunity_title, to)
+            return False
+
+        success = True
+        for i, chunk in enumerate(messages, 1):
+            if bucket is not None:
+                await bucket.acquire_async()
+            if not await self.send_text_async(to, chunk):
+                success = False
+                logger.warning("Failed to send proposal chunk %d/%d to %s", i, len(messages), to)
+
+        if success and len(messages) > 1:
+            logger.info("Sent proposal text for '%s' to %s (%d parts)", opportunity_title, to, len(messages))
+
+        return success
+
+    async def send_proposal_text_many_async(
+        self,
+        recipients: List[str],
+        proposal_text: str,
+        opportunity_title: str,
+        *,
+        concurrency: int = DEFAULT_SEND_CONCURRENCY,
+        rate: float = DEFAULT_SEND_RATE,
+    ) -> List[bool]:
+        """Send a proposal to all recipients concurrently, within `rate` messages/s."""
+        messages = self._proposal_messages(proposal_text)
+        bucket = _TokenBucket(rate)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _send(to: str) -> bool:
+            async with semaphore:
+                return await self._send_proposal_parts_async(to, messages, opportunity_title, bucket)
+
+        return list(await asyncio.gather(*(_send(to) for to in recipients)))
+
+    def send_proposal_text_many(
+        self, recipients: List[str], proposal_text: str, opportunity_title: str
+    ) -> List[bool]:
+        if len(recipients) < 2:
+            return super().send_proposal_text_many(recipients, proposal_text, opportunity_title)
+
+        async def _send_all() -> List[bool]:
+            try:
+                return await self.send_proposal_text_many_async(recipients, proposal_text, opportunity_title)
+            finally:
+                await self.close_async()
+
+        return _run_coroutine_sync(_send_all())
+
+    def send_text(self, to: Recipient, message: str) -> bool:
+        return self._send_text_tracked(to, message) is not None
+
+    def _send_text_tracked(self, to: Recipient, message: str) -> Optional[str]:
         try:
-            upload_url = f"https://graph.facebook.com/{self.api_version}/{self.phone_number_id}/media"
-            headers = {"Authorization": f"Bearer {self.access_token}"}
+            if isinstance(to, PreparedRecipient):
+                to = to.number
+            payload = {**self._text_payload_template, "to": to, "text": {"body": message}}
+
+            response = self._post_json(self.base_url, payload)
+            response.raise_for_status()
+
+            logger.info("Sent Meta WhatsApp message to %s", to)
+            # Graph API returns the WhatsApp message id used by status webhooks
+            try:
+                return response.json()["messages"][0]["id"]
+            except (ValueError, KeyError, IndexError, TypeError):
+                return ""
+        except Exception as exc:  # pragma: no cover - network errors
+            logger.error("Error sending Meta WhatsApp message: %s", exc)
+            return None
 
+    def send_document(self, to: str, document_path: str, caption: Optional[str] = None) -> bool:
+        try:
+            upload_url = self._upload_url
             with open(document_path, "rb") as file:
-                files = {"file": file}
                 data = {"messaging_product": "whatsapp", "type": "document"}
                 if caption:
                     data["caption"] = caption
 
-                response = requests.post(upload_url, files=files, data=data, headers=headers, timeout=60)
+                # httpx streams the file into the multipart body in chunks
+                filename = os.path.basename(document_path)
+                mime_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                response = self._client.post(
+                    upload_url,
+                    data=data,
+                    files={"file": (filename, file, mime_type)},
+                    timeout=GRAPH_API_UPLOAD_TIMEOUT,
+                )
                 response.raise_for_status()
                 media_id = response.json()["id"]
 
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-            }
-            payload = {
-                "messaging_product": "whatsapp",
-                "recipient_type": "individual",
-                "to": to,
-                "type": "document",
-                "document": {"id": media_id},
-            }
-
-            response = requests.post(self.base_url, json=payload, headers=headers, timeout=30)
+            payload = {**self._document_payload_template, "to": to, "document": {"id": media_id}}
+
+            response = self._post_json(self.base_url, payload)
             response.raise_for_status()
 
             logger.info("Sent Meta WhatsApp document to %s", to)
@@ -188,31 +914,41 @@ class TwilioWhatsAppSender(BaseWhatsAppSender):
         ):
             raise ValueError("Twilio WhatsApp configuration is incomplete")
 
-        self.client = TwilioClient(settings.twilio_account_sid, settings.twilio_auth_token)
+        # Pooled keep-alive connections to api.twilio.com
+        self._http_client = TwilioHttpClient(pool_connections=True)
+        self._http_client.session.mount("https://", HTTPAdapter(pool_maxsize=32))
+        self.client = TwilioClient(
+            settings.twilio_account_sid, settings.twilio_auth_token, http_client=self._http_client
+        )
         self.from_number = self._format_number(settings.twilio_whatsapp_number)
 
+    def close(self) -> None:
+        super().close()
+        self._http_client.session.close()
+
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _format_number(number: str) -> str:
-        formatted = (number or "").strip()
-        formatted = formatted.replace("whatsapp://", "")
-        formatted = formatted.replace("whatsapp:", "")
-        formatted = formatted.replace("whatsapp", "")
-        formatted = formatted.replace(":", "")
-        formatted = formatted.strip()
-        formatted = formatted.lstrip("+")
+        formatted = WHATSAPP_PREFIX_RE.sub("", number or "").strip().lstrip("+")
         if not formatted:
             raise ValueError("Invalid WhatsApp number")
         return f"whatsapp:+{formatted}"
 
-    def send_text(self, to: str, message: str) -> bool:
+    def send_text(self, to: Recipient, message: str) -> bool:
+        return self._send_text_tracked(to, message) is not None
+
+    def _send_text_tracked(self, to: Recipient, message: str) -> Optional[str]:
         try:
-            formatted_to = self._format_number(to)
-            logger.debug("Sending Twilio message to %s (from %s): %s", 
-                        formatted_to, self.from_number, message[:100])
+            formatted_to = to.wa if isinstance(to, PreparedRecipient) else self._format_number(to)
+            # Skip building the message preview unless debug logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending Twilio message to %s (from %s): %s",
+                             formatted_to, self.from_number, message[:100])
             result = self.client.messages.create(from_=self.from_number, to=formatted_to, body=message)
             logger.info("Sent Twilio WhatsApp message to %s (SID: %s, Status: %s)", 
                        formatted_to, result.sid, result.status)
-            return True
+            # Twilio status callbacks report progress by MessageSid
+            return result.sid or ""
         except TwilioException as exc:  # pragma: no cover - network errors
             error_code = getattr(exc, 'code', None)
             error_msg = str(exc)
@@ -239,7 +975,7 @@ class TwilioWhatsAppSender(BaseWhatsAppSender):
             elif error_code == 21211:
                 logger.error("Twilio Invalid Number: Check recipient number format")
             
-            return False
+            return None
 
     def send_document(self, to: str, document_path: str, caption: Optional[str] = None) -> bool:
         logger.warning(
@@ -249,10 +985,53 @@ class TwilioWhatsAppSender(BaseWhatsAppSender):
         return self.send_text(to, fallback_message)
 
 
+_sender: Optional[BaseWhatsAppSender] = None
+_sender_config: Optional[Tuple[str, ...]] = None
+# Senders replaced after a settings change; callers may still hold them
+_retired_senders: List[BaseWhatsAppSender] = []
+_sender_lock = threading.Lock()
+
+
 def get_whatsapp_sender() -> BaseWhatsAppSender:
-    """Return the configured WhatsApp sender."""
-    provider = (settings.whatsapp_provider or "meta").lower()
+    """
+    Return the configured WhatsApp sender.
+    
+    The sender (and its HTTP connection pool) is shared until the provider
+    settings change. Replaced senders stay open for callers that still hold
+    them; close_whatsapp_senders() closes them all at shutdown.
+    """
+    global _sender, _sender_config
+    config = (
+        (settings.whatsapp_provider or "meta").lower(),
+        settings.whatsapp_access_token,
+        settings.whatsapp_phone_number_id,
+        settings.whatsapp_api_version,
+        settings.twilio_account_sid,
+        settings.twilio_auth_token,
+        settings.twilio_whatsapp_number,
+    )
+    with _sender_lock:
+        if _sender is None or _sender_config != config:
+            if _sender is not None:
+                _retired_senders.append(_sender)
+            _sender = _build_sender(config[0])
+            _sender_config = config
+        return _sender
+
+
+def close_whatsapp_senders() -> None:
+    """Close every sender built by get_whatsapp_sender (call at process shutdown)."""
+    global _sender, _sender_config
+    with _sender_lock:
+        senders = _retired_senders + ([_sender] if _sender is not None else [])
+        _retired_senders.clear()
+        _sender = None
+        _sender_config = None
+    for sender in senders:
+        sender.close()
 
+
+def _build_sender(provider: str) -> BaseWhatsAppSender:
     if provider == "twilio":
         return TwilioWhatsAppSender()
 
@@ -260,4 +1039,3 @@ def get_whatsapp_sender() -> BaseWhatsAppSender:
         logger.warning("Unknown WhatsApp provider '%s', defaulting to Meta", provider)
 
     return MetaWhatsAppSender()
-